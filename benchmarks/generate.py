@@ -0,0 +1,119 @@
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+
+# Benchmark scales: tenants, members per tenant and years of history
+SCALES = {
+    'small': {'tenants': 2, 'members': 200, 'years': 1},
+    'medium': {'tenants': 3, 'members': 2000, 'years': 2},
+    'large': {'tenants': 3, 'members': 10000, 'years': 3},
+}
+
+FIRST_NAMES = ['James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda',
+               'William', 'Elizabeth', 'David', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica',
+               'Thomas', 'Sarah', 'Charles', 'Karen', 'Aisha', 'Omar', 'Mei', 'Hiro', 'Priya']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis',
+              'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Wilson', 'Anderson', 'Thomas',
+              'Taylor', 'Moore', 'Jackson', 'Martin', 'Lee', 'Khan', 'Chen', 'Tanaka', 'Patel']
+
+MEMBERSHIP_TYPES = (['Basic', 'Premium', 'VIP'], [0.6, 0.3, 0.1])
+INCOME_CATEGORIES = ['Membership Fees', 'Personal Training', 'Merchandise', 'Day Passes']
+EXPENSE_CATEGORIES = ['Rent', 'Salaries', 'Equipment', 'Utilities', 'Maintenance']
+
+def generate_tenant(tenant_index: int, members: int, years: int, seed: int = 42,
+                    end_date: date = None) -> dict:
+    """Generate one tenant's members, attendance, finance and measurements.
+
+    Returns DataFrames laid out like the CSVs BulkImporter takes, with
+    members carrying source ids that the other tables reference. The same
+    arguments always produce the same data; ``end_date`` defaults to today
+    so recent-window queries find rows.
+    """
+    rng = np.random.default_rng([seed, tenant_index])
+    end_date = end_date or date.today()
+    days = 365 * years
+    start = np.datetime64(end_date - timedelta(days=days - 1))
+
+    ids = np.arange(1, members + 1)
+    join_offsets = rng.integers(0, days, members)
+    members_df = pd.DataFrame({
+        'id': ids,
+        'name': (pd.Series(rng.choice(FIRST_NAMES, members)) + ' '
+                 + pd.Series(rng.choice(LAST_NAMES, members)) + ' ' + pd.Series(ids).astype(str)),
+        'email': [f"member{tenant_index}_{i}@example.com" for i in ids],
+        'phone': [f"555-{i:07d}" for i in ids],
+        'join_date': start + join_offsets.astype('timedelta64[D]'),
+        'membership_type': rng.choice(MEMBERSHIP_TYPES[0], members, p=MEMBERSHIP_TYPES[1]),
+        'status': rng.choice(['Active', 'Inactive'], members, p=[0.85, 0.15]),
+        'emergency_contact': [f"555-{i + 5000000:07d}" for i in ids],
+    })
+
+    # Visits: each member comes a few times a week between joining and the end date
+    weekly_rate = rng.gamma(2.0, 1.25, members)
+    visits = rng.poisson(weekly_rate * (days - join_offsets) / 7)
+    member_of_visit = np.repeat(np.arange(members), visits)
+    visit_offsets = join_offsets[member_of_visit] + (
+        rng.random(len(member_of_visit)) * (days - join_offsets[member_of_visit])
+    ).astype(int)
+    check_in = rng.integers(5 * 60, 21 * 60, len(member_of_visit))
+    check_out = np.minimum(check_in + rng.integers(30, 120, len(member_of_visit)), 23 * 60 + 59)
+    still_open = rng.random(len(member_of_visit)) < 0.02
+    attendance_df = pd.DataFrame({
+        'member_id': ids[member_of_visit],
+        'date': start + visit_offsets.astype('timedelta64[D]'),
+        'check_in': _clock(check_in),
+        'check_out': np.where(still_open, '', _clock(check_out)),
+    }).sort_values(['date', 'check_in'], kind='stable')
+
+    # Finance: income scales with the roster, plus a few expenses every day
+    income_per_day = rng.poisson(max(members / 40, 1), days)
+    expense_per_day = rng.poisson(3, days)
+    income_days = np.repeat(np.arange(days), income_per_day)
+    expense_days = np.repeat(np.arange(days), expense_per_day)
+    finance_df = pd.DataFrame({
+        'date': start + np.concatenate([income_days, expense_days]).astype('timedelta64[D]'),
+        'type': ['income'] * len(income_days) + ['expense'] * len(expense_days),
+        'category': np.concatenate([
+            rng.choice(INCOME_CATEGORIES, len(income_days)),
+            rng.choice(EXPENSE_CATEGORIES, len(expense_days)),
+        ]),
+        'amount': np.concatenate([
+            rng.choice([29.99, 49.99, 79.99, 120.0], len(income_days)),
+            rng.gamma(2.0, 150.0, len(expense_days)),
+        ]).round(2),
+    })
+    finance_df['description'] = finance_df['category'] + ' #' + pd.Series(range(len(finance_df))).astype(str)
+    finance_df = finance_df.sort_values('date', kind='stable')
+
+    # Measurements: a third of members check in monthly, drifting from a baseline
+    tracked = rng.choice(members, members // 3, replace=False)
+    months = np.maximum((days - join_offsets[tracked]) // 30, 1)
+    member_of_row = np.repeat(tracked, months)
+    month_index = np.concatenate([np.arange(n) for n in months]) if len(months) else np.array([], int)
+    height = rng.normal(172, 9, members).round(1)
+    base_weight = rng.normal(80, 12, members)
+    drift = rng.normal(-0.2, 0.4, members)
+    measurements_df = pd.DataFrame({
+        'member_id': ids[member_of_row],
+        'date': start + (join_offsets[member_of_row] + month_index * 30).astype('timedelta64[D]'),
+        'weight': (base_weight[member_of_row] + drift[member_of_row] * month_index).round(1),
+        'height': height[member_of_row],
+        'chest': (100 + rng.normal(0, 1, len(member_of_row))).round(1),
+        'waist': (85 + drift[member_of_row] * month_index / 2).round(1),
+        'arms': (34 + rng.normal(0, 0.5, len(member_of_row))).round(1),
+        'legs': (56 + rng.normal(0, 0.5, len(member_of_row))).round(1),
+    })
+
+    return {
+        'members': members_df,
+        'attendance': attendance_df,
+        'finance': finance_df,
+        'measurements': measurements_df,
+    }
+
+def _clock(minutes: np.ndarray) -> np.ndarray:
+    """Format minutes after midnight as HH:MM:SS strings."""
+    return np.char.add(
+        np.char.add(np.char.zfill((minutes // 60).astype(str), 2), ':'),
+        np.char.add(np.char.zfill((minutes % 60).astype(str), 2), ':00')
+    )
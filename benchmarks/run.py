@@ -0,0 +1,393 @@
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extensions import make_dsn, parse_dsn
+from benchmarks.generate import SCALES, generate_tenant
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tables loaded per tenant, members first so the others can map member ids
+LOAD_ORDER = ('members', 'attendance', 'finance', 'measurements')
+
+def measure(fn, repeat: int, reset=None) -> dict:
+    """Time ``fn`` ``repeat`` times and summarize the runs in milliseconds.
+
+    With ``reset``, each run starts from cold in-process caches; a second
+    set of runs without resetting is reported as ``warm``.
+    """
+    def timed(before):
+        runs = []
+        for _ in range(repeat):
+            if before:
+                before()
+            started = time.perf_counter()
+            fn()
+            runs.append((time.perf_counter() - started) * 1000)
+        return {
+            'min_ms': round(min(runs), 3),
+            'median_ms': round(statistics.median(runs), 3),
+            'max_ms': round(max(runs), 3),
+        }
+
+    if reset is None:
+        return timed(None)
+    return {'cold': timed(reset), 'warm': timed(None)}
+
+def reset_caches():
+    """Drop every in-process cache so the next call goes to the database."""
+    from utils.auth_manager import get_session_cache
+    from utils.charts import get_figure_cache
+    from utils.incremental import get_delta_store
+    from utils.query_cache import get_query_cache
+    from utils.tenant_manager import get_tenant_directory
+
+    get_query_cache().clear()
+    get_session_cache().clear()
+    get_figure_cache().clear()
+    get_delta_store().reset()
+    get_tenant_directory().invalidate()
+
+def load_tenants(params: dict, seed: int) -> dict:
+    """Create the tenants under one owner account and bulk-load their generated data."""
+    from utils.auth_manager import AuthManager
+    from utils.bulk_import import BulkImporter
+    from utils.tenant_manager import TenantManager
+
+    tm = TenantManager()
+    auth = AuthManager()
+    owner = auth.register_user('owner@bench.example.com', 'bench-password', 'Bench Owner', role='owner')
+    tenants = []
+    load = {}
+    for index in range(params['tenants']):
+        tenant = tm.create_tenant(f"Bench Gym {index + 1}", f"bench{index + 1}", owner_id=owner['id'])
+        importer = BulkImporter(tenant['id'])
+        frames = generate_tenant(index, params['members'], params['years'], seed)
+        for table in LOAD_ORDER:
+            report = importer.import_csv(table, io.StringIO(frames[table].to_csv(index=False)))
+            if report['rows_rejected']:
+                raise ValueError(f"Generated {table} rows were rejected: {report['rejected'][:5]}")
+            entry = load.setdefault(table, {'rows': 0, 'seconds': 0.0})
+            entry['rows'] += report['rows_imported']
+            entry['seconds'] = round(entry['seconds'] + report['seconds'], 3)
+        tenants.append({'id': tenant['id'], 'subdomain': tenant['subdomain'],
+                        'owner_email': owner['email'], 'owner_id': owner['id']})
+    return {'tenants': tenants, 'load': load}
+
+def benchmark_reads(tenant: dict) -> dict:
+    """Read benchmarks by name, each a zero-argument callable."""
+    from utils.auth_manager import AuthManager
+    from utils.charts import (cached_figures, create_attendance_chart, create_financial_chart,
+                              create_member_progress_figures, create_portfolio_chart)
+    from utils.data_manager import DataManager
+    from utils.tenant_manager import TenantManager
+
+    dm = DataManager(tenant['id'])
+    tm = TenantManager()
+    auth = AuthManager()
+    session_id = auth.login_user(tenant['owner_email'], 'bench-password')['session_id']
+    today = date.today()
+    week_start, month_start, year_start = (str(today - timedelta(days=d)) for d in (6, 29, 364))
+    end = str(today)
+    member_id = next(iter(dm.get_member_directory()))
+    measured_id = _measured_member(dm)
+
+    def dashboard_page():
+        auth.validate_session(session_id)
+        tm.list_tenants()
+        dm.get_dashboard_metrics()
+
+    def members_page():
+        statuses = dm.get_member_statuses()
+        page = dm.search_members('', statuses, after_id=0, limit=50)
+        dm.search_members('', statuses, after_id=int(page['id'].iloc[-1]), limit=50)
+        dm.get_member(member_id)
+
+    def attendance_page():
+        dm.get_member_directory()
+        series_df = dm.get_attendance_series(week_start, end)
+        create_attendance_chart(series_df)
+        dm.get_attendance_report(week_start, end)
+        dm.get_attendance_stats(week_start, end)
+
+    def finance_page():
+        dm.get_finance_totals()
+        create_financial_chart(dm.get_finance_series())
+        dm.get_recent_transactions(10)
+        dm.get_finance_totals(month_start, end)
+
+    def portfolio_page():
+        auth.validate_session(session_id)
+        summary_df = tm.get_owner_summary(tenant['owner_id'], month_start, end)
+        create_portfolio_chart(summary_df)
+
+    def fitness_page():
+        dm.get_member_directory()
+        latest_date, count = dm.get_measurement_version(measured_id)
+        cached_figures((tenant['id'], measured_id, latest_date, count),
+                       lambda: create_member_progress_figures(dm.get_measurements(measured_id)))
+        dm.get_measurements(measured_id)
+
+    return {
+        'DataManager.get_members': dm.get_members,
+        'DataManager.get_member': lambda: dm.get_member(member_id),
+        'DataManager.get_member_directory': dm.get_member_directory,
+        'DataManager.lookup_members': lambda: dm.lookup_members('ma'),
+        'DataManager.search_members': lambda: dm.search_members('son', None),
+        'DataManager.get_attendance_daily': lambda: dm.get_attendance_daily(year_start, end),
+        'DataManager.get_attendance_series': dm.get_attendance_series,
+        'DataManager.get_attendance_stats': lambda: dm.get_attendance_stats(month_start, end),
+        'DataManager.get_attendance_report': lambda: dm.get_attendance_report(month_start, end),
+        'DataManager.get_financial_summary': dm.get_financial_summary,
+        'DataManager.get_recent_transactions': dm.get_recent_transactions,
+        'DataManager.get_finance_totals': dm.get_finance_totals,
+        'DataManager.get_finance_series': dm.get_finance_series,
+        'DataManager.get_measurements': lambda: dm.get_measurements(measured_id),
+        'DataManager.get_measurement_version': lambda: dm.get_measurement_version(measured_id),
+        'DataManager.get_dashboard_metrics': dm.get_dashboard_metrics,
+        'DataManager.get_data': dm.get_data,
+        'DataManager.get_data[sequential]': lambda: dm.get_data(concurrent=False),
+        'DataManager.get_data[full]': lambda: dm.get_data(incremental=False),
+        'DataManager.get_data[full,sequential]': lambda: dm.get_data(concurrent=False, incremental=False),
+        'AuthManager.validate_session': lambda: auth.validate_session(session_id),
+        'AuthManager.get_user_by_id': lambda: auth.get_user_by_id(tenant['owner_id']),
+        'TenantManager.list_tenants': tm.list_tenants,
+        'TenantManager.get_tenant_by_subdomain': lambda: tm.get_tenant_by_subdomain(tenant['subdomain']),
+        'TenantManager.validate_tenant_access': lambda: tm.validate_tenant_access(tenant['id']),
+        'TenantManager.list_owner_tenants': lambda: tm.list_owner_tenants(tenant['owner_id']),
+        'TenantManager.get_owner_summary': lambda: tm.get_owner_summary(tenant['owner_id']),
+        'page.dashboard': dashboard_page,
+        'page.members': members_page,
+        'page.attendance': attendance_page,
+        'page.finance': finance_page,
+        'page.fitness': fitness_page,
+        'page.portfolio': portfolio_page,
+    }
+
+def benchmark_writes(tenant: dict) -> dict:
+    """Write benchmarks by name; each call inserts or updates fresh rows."""
+    from utils.auth_manager import AuthManager
+    from utils.data_manager import DataManager
+    from utils.tenant_manager import TenantManager
+
+    dm = DataManager(tenant['id'])
+    tm = TenantManager()
+    auth = AuthManager()
+    member_ids = list(dm.get_member_directory())
+    serial = itertools.count(1)
+
+    def register_user():
+        auth.register_user(f"staff{next(serial)}@bench.example.com", 'bench-password',
+                           'Bench Staff', tenant_id=tenant['id'])
+
+    def login_logout():
+        session = auth.login_user(tenant['owner_email'], 'bench-password')
+        auth.logout_user(session['session_id'])
+
+    def create_tenant():
+        n = next(serial)
+        tm.create_tenant(f"Extra Gym {n}", f"extra{n}")
+
+    def add_member():
+        n = next(serial)
+        dm.add_member({'name': f"Walk In {n}", 'email': f"walkin{n}@example.com", 'phone': '555-0000',
+                       'membership_type': 'Basic', 'status': 'Active', 'emergency_contact': '555-0001'})
+
+    def record_attendance_batch():
+        now = datetime.now()
+        events = [
+            {'member_id': member_ids[i % len(member_ids)], 'check_in': i < 50,
+             'timestamp': now + timedelta(seconds=i)}
+            for i in range(100)
+        ]
+        dm.record_attendance_batch(events)
+
+    return {
+        'AuthManager.register_user': register_user,
+        'AuthManager.login_user+logout_user': login_logout,
+        'TenantManager.create_tenant': create_tenant,
+        'TenantManager.update_tenant_settings': lambda: tm.update_tenant_settings(
+            tenant['id'], {'bench_run': next(serial)}),
+        'DataManager.add_member': add_member,
+        'DataManager.update_member': lambda: dm.update_member(member_ids[0], {'phone': f"555-{next(serial):07d}"}),
+        'DataManager.record_attendance': lambda: dm.record_attendance(member_ids[1]),
+        'DataManager.record_attendance_batch[100]': record_attendance_batch,
+        'DataManager.add_financial_record': lambda: dm.add_financial_record(
+            {'type': 'income', 'category': 'Day Passes', 'amount': 15.0, 'description': 'bench'}),
+        'DataManager.add_measurements': lambda: dm.add_measurements(
+            {'member_id': member_ids[2], 'weight': 80.0, 'height': 180.0,
+             'chest': 100.0, 'waist': 85.0, 'arms': 34.0, 'legs': 56.0}),
+    }
+
+def _measured_member(dm) -> int:
+    """Id of the member with the longest measurement history."""
+    with dm.pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT member_id FROM measurements WHERE tenant_id = %s
+                GROUP BY member_id ORDER BY COUNT(*) DESC, member_id LIMIT 1
+                """,
+                (dm.tenant_id,)
+            )
+            return cur.fetchone()[0]
+
+def run_scale(params: dict, repeat: int, seed: int) -> dict:
+    """Migrate the current database, load one scale and time everything.
+
+    Runs in a child process whose ``DATABASE_URL`` points at a fresh
+    database, so pools, caches and the tenant directory start empty.
+    """
+    from utils.migrations import migrate
+
+    migrate()
+    loaded = load_tenants(params, seed)
+    # Benchmarks run against the first tenant; the others add realistic
+    # volume to the shared tables and indexes
+    tenant = loaded['tenants'][0]
+    counts = _row_counts(tenant['id'])
+
+    benchmarks = {}
+    for name, fn in benchmark_reads(tenant).items():
+        benchmarks[name] = measure(fn, repeat, reset=reset_caches)
+    for name, fn in benchmark_writes(tenant).items():
+        benchmarks[name] = measure(fn, repeat)
+    return {'params': params, 'rows': counts, 'load': loaded['load'], 'benchmarks': benchmarks}
+
+def _row_counts(tenant_id: int) -> dict:
+    from utils.db_pool import get_pool
+
+    counts = {}
+    with get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            for table in LOAD_ORDER + ('attendance_daily', 'finance_daily', 'finance_monthly'):
+                cur.execute(
+                    sql.SQL("SELECT COUNT(*) FILTER (WHERE tenant_id = %s), COUNT(*) FROM {}")
+                    .format(sql.Identifier(table)),
+                    (tenant_id,)
+                )
+                tenant_rows, total_rows = cur.fetchone()
+                counts[table] = {'tenant': tenant_rows, 'total': total_rows}
+    return counts
+
+def run_isolated(admin_dsn: str, params: dict, repeat: int, seed: int) -> dict:
+    """Run one scale in a child process against a throwaway database."""
+    dbname = f"gymflow_bench_{uuid.uuid4().hex[:12]}"
+    admin = psycopg2.connect(admin_dsn)
+    admin.autocommit = True
+    try:
+        with admin.cursor() as cur:
+            cur.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(dbname)))
+        env = dict(os.environ, DATABASE_URL=make_dsn(admin_dsn, dbname=dbname))
+        child = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.run', '--child', json.dumps(params),
+             '--repeat', str(repeat), '--seed', str(seed)],
+            cwd=REPO_ROOT, env=env, stdout=subprocess.PIPE, check=True
+        )
+        return json.loads(child.stdout)
+    finally:
+        with admin.cursor() as cur:
+            cur.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(dbname)))
+        admin.close()
+
+def environment(admin_dsn: str) -> dict:
+    """Describe what the numbers were measured on."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    with psycopg2.connect(admin_dsn) as conn:
+        server_version = conn.server_version
+    conn.close()
+    return {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'postgres': server_version,
+        'host': parse_dsn(admin_dsn).get('host'),
+    }
+
+def compare(results: dict, baseline: dict) -> list:
+    """Median ratios (current / baseline) for benchmarks present in both runs."""
+    lines = []
+    for scale, current in results['scales'].items():
+        previous = baseline.get('scales', {}).get(scale)
+        if not previous:
+            continue
+        for name, timing in current['benchmarks'].items():
+            before = previous['benchmarks'].get(name)
+            if not before:
+                continue
+            for phase in ('cold', 'warm') if 'cold' in timing else (None,):
+                now_ms = (timing[phase] if phase else timing)['median_ms']
+                then_ms = (before[phase] if phase else before)['median_ms']
+                label = f"{name} [{phase}]" if phase else name
+                ratio = now_ms / then_ms if then_ms else float('inf')
+                lines.append((scale, label, then_ms, now_ms, ratio))
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time the managers and page data paths on generated data in a throwaway database."
+    )
+    parser.add_argument('--scales', default='small',
+                        help=f"comma-separated presets: {', '.join(SCALES)}")
+    parser.add_argument('--tenants', type=int, help="override tenants per scale")
+    parser.add_argument('--members', type=int, help="override members per tenant")
+    parser.add_argument('--years', type=int, help="override years of history")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per benchmark")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="write the JSON results here instead of stdout")
+    parser.add_argument('--compare', metavar='BASELINE', help="earlier results to print median ratios against")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # Anything the app prints goes to stderr; stdout carries only the results
+        stdout, sys.stdout = sys.stdout, sys.stderr
+        result = run_scale(json.loads(args.child), args.repeat, args.seed)
+        stdout.write(json.dumps(result, default=str))
+        return
+
+    admin_dsn = os.environ.get('BENCH_DATABASE_URL') or os.environ.get('DATABASE_URL')
+    if not admin_dsn:
+        raise SystemExit("Set BENCH_DATABASE_URL or DATABASE_URL to a server where databases can be created")
+
+    results = {'environment': environment(admin_dsn), 'repeat': args.repeat, 'seed': args.seed, 'scales': {}}
+    for scale in args.scales.split(','):
+        if scale not in SCALES:
+            raise SystemExit(f"Unknown scale: {scale}")
+        params = dict(SCALES[scale])
+        for key in ('tenants', 'members', 'years'):
+            if getattr(args, key):
+                params[key] = getattr(args, key)
+        print(f"Running {scale}: {params}", file=sys.stderr)
+        results['scales'][scale] = run_isolated(admin_dsn, params, args.repeat, args.seed)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for scale, label, then_ms, now_ms, ratio in compare(results, baseline):
+            print(f"{scale:<8}{label:<56}{then_ms:>10.2f}{now_ms:>10.2f}{ratio:>8.2f}x", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,25 @@
 import streamlit as st
-from datetime import datetime
 import pandas as pd
 from utils.tenant_manager import TenantManager
 from utils.data_manager import DataManager
 from utils.auth_manager import AuthManager
+from utils.page_auth import require_auth
+from utils.session_sweeper import start_background_sweeper
+from utils.profiler import start_page
+
+# Per-section timings of this rerun (only recorded with PAGE_PROFILE=1)
+profile = start_page("Dashboard")
 
 # Initialize managers
 tm = TenantManager()
 auth = AuthManager()
 
+# Reclaim expired and logged-out sessions in the background (once per process)
+start_background_sweeper()
+
 # Check authentication
-if 'user' not in st.session_state:
-    st.switch_page("pages/Login.py")
+with profile.section("auth"):
+    require_auth()
 
 # Initialize page
 st.set_page_config(
@@ -22,7 +30,7 @@ st.set_page_config(
 )
 
 # Add logout and tenant management to sidebar
-with st.sidebar:
+with st.sidebar, profile.section("sidebar"):
     if 'user' in st.session_state:
         # Show current user and gym info
         st.write(f"**Logged in as:** {st.session_state.user['name']}")
@@ -69,8 +77,9 @@ with st.sidebar:
 # Initialize DataManager with the current tenant
 dm = DataManager(st.session_state.user['tenant_id'])
 
-# Read data for dashboard using tenant-aware DataManager
-members_df, finance_df, attendance_df = dm.get_data()
+# Aggregate dashboard KPIs server-side instead of loading full tables
+with profile.section("load metrics"):
+    metrics = dm.get_dashboard_metrics()
 
 # Hero Section
 st.markdown(f"""
@@ -88,17 +97,17 @@ col1, col2, col3 = st.columns(3)
 metrics_data = [
     {
         "label": "Total Members",
-        "value": len(members_df) if not members_df.empty else 0,
+        "value": metrics['total_members'],
         "icon": "👥"
     },
     {
         "label": "Today's Attendance",
-        "value": len(attendance_df[attendance_df['date'] == str(datetime.now().date())]) if not attendance_df.empty else 0,
+        "value": metrics['todays_attendance'],
         "icon": "📋"
     },
     {
         "label": "Monthly Revenue",
-        "value": f"${finance_df[finance_df['type'] == 'income']['amount'].sum():,.2f}" if not finance_df.empty else "$0.00",
+        "value": f"${metrics['total_income']:,.2f}",
         "icon": "💰"
     }
 ]
@@ -178,4 +187,6 @@ st.markdown("""
         <p style="color: #6c757d; margin: 0;">© 2024 GymFlow Management System</p>
         <p style="color: #6c757d; margin: 0.5rem 0;">Made with ❤️ for fitness enthusiasts</p>
     </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+profile.finish()
@@ -0,0 +1,76 @@
+-- Base schema used by the managers in utils/. IF NOT EXISTS lets this
+-- adopt databases that were created by hand before migrations existed.
+
+CREATE TABLE IF NOT EXISTS tenants (
+    id SERIAL PRIMARY KEY,
+    name TEXT NOT NULL,
+    subdomain TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    status TEXT NOT NULL DEFAULT 'active',
+    settings JSONB NOT NULL DEFAULT '{}'::jsonb
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    tenant_id INTEGER REFERENCES tenants (id),
+    email TEXT NOT NULL,
+    password_hash TEXT NOT NULL,
+    name TEXT NOT NULL,
+    role TEXT NOT NULL DEFAULT 'staff',
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    status TEXT NOT NULL DEFAULT 'active'
+);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    session_id TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL,
+    is_active BOOLEAN NOT NULL DEFAULT TRUE
+);
+
+CREATE TABLE IF NOT EXISTS members (
+    id SERIAL PRIMARY KEY,
+    tenant_id INTEGER NOT NULL REFERENCES tenants (id),
+    name TEXT NOT NULL,
+    email TEXT,
+    phone TEXT,
+    join_date DATE NOT NULL DEFAULT CURRENT_DATE,
+    membership_type TEXT,
+    status TEXT,
+    emergency_contact TEXT
+);
+
+CREATE TABLE IF NOT EXISTS attendance (
+    id SERIAL PRIMARY KEY,
+    tenant_id INTEGER NOT NULL REFERENCES tenants (id),
+    member_id INTEGER NOT NULL REFERENCES members (id),
+    date DATE NOT NULL,
+    check_in TIME NOT NULL,
+    check_out TIME
+);
+
+CREATE TABLE IF NOT EXISTS finance (
+    id SERIAL PRIMARY KEY,
+    tenant_id INTEGER NOT NULL REFERENCES tenants (id),
+    date DATE NOT NULL DEFAULT CURRENT_DATE,
+    type TEXT NOT NULL,
+    category TEXT,
+    amount NUMERIC(12, 2) NOT NULL,
+    description TEXT
+);
+
+CREATE TABLE IF NOT EXISTS measurements (
+    id SERIAL PRIMARY KEY,
+    tenant_id INTEGER NOT NULL REFERENCES tenants (id),
+    member_id INTEGER NOT NULL REFERENCES members (id),
+    date DATE NOT NULL DEFAULT CURRENT_DATE,
+    weight NUMERIC(6, 2),
+    height NUMERIC(6, 2),
+    chest NUMERIC(6, 2),
+    waist NUMERIC(6, 2),
+    arms NUMERIC(6, 2),
+    legs NUMERIC(6, 2),
+    bmi NUMERIC(5, 2)
+);
@@ -0,0 +1,44 @@
+-- Indexes backing the queries in utils/data_manager.py and utils/auth_manager.py.
+-- Unique indexes reuse the names Postgres gives UNIQUE constraints, so
+-- databases that already declared those constraints are left alone.
+
+-- Lookups by subdomain, login by email and session validation
+CREATE UNIQUE INDEX IF NOT EXISTS tenants_subdomain_key ON tenants (subdomain);
+CREATE UNIQUE INDEX IF NOT EXISTS users_email_key ON users (email);
+CREATE UNIQUE INDEX IF NOT EXISTS sessions_session_id_key ON sessions (session_id);
+
+-- Member listing and keyset pagination (WHERE tenant_id = ? AND id > ? ORDER BY id)
+CREATE INDEX IF NOT EXISTS members_tenant_id_idx ON members (tenant_id, id);
+
+-- Short name searches match on a prefix of lower(name)
+CREATE INDEX IF NOT EXISTS members_tenant_lower_name_idx
+    ON members (tenant_id, lower(name) text_pattern_ops);
+
+-- Longer name searches use ILIKE '%...%', which needs a trigram index
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS members_name_trgm_idx
+            ON members USING gin (name gin_trgm_ops);
+    END IF;
+END
+$$;
+
+-- Attendance reports by date range and per-member history
+CREATE INDEX IF NOT EXISTS attendance_tenant_date_idx ON attendance (tenant_id, date);
+CREATE INDEX IF NOT EXISTS attendance_tenant_member_date_idx
+    ON attendance (tenant_id, member_id, date);
+
+-- Check-outs only ever look for visits that are still open
+CREATE INDEX IF NOT EXISTS attendance_open_checkins_idx
+    ON attendance (tenant_id, member_id, date)
+    WHERE check_out IS NULL;
+
+-- Finance listings by date and income/expense totals
+CREATE INDEX IF NOT EXISTS finance_tenant_date_idx ON finance (tenant_id, date);
+CREATE INDEX IF NOT EXISTS finance_tenant_type_idx ON finance (tenant_id, type) INCLUDE (amount);
+
+-- Measurement history of a member
+CREATE INDEX IF NOT EXISTS measurements_tenant_member_date_idx
+    ON measurements (tenant_id, member_id, date);
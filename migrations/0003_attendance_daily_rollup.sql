@@ -0,0 +1,22 @@
+-- Per-tenant daily attendance totals, kept current by DataManager.record_attendance_batch
+-- and the bulk importer so charts and statistics scale with days, not visits.
+
+CREATE TABLE IF NOT EXISTS attendance_daily (
+    tenant_id INTEGER NOT NULL REFERENCES tenants (id),
+    date DATE NOT NULL,
+    visits INTEGER NOT NULL DEFAULT 0,
+    unique_members INTEGER NOT NULL DEFAULT 0,
+    completed_visits INTEGER NOT NULL DEFAULT 0,
+    total_session_seconds BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (tenant_id, date)
+);
+
+-- Backfill from existing attendance
+INSERT INTO attendance_daily (
+    tenant_id, date, visits, unique_members, completed_visits, total_session_seconds
+)
+SELECT tenant_id, date, COUNT(*), COUNT(DISTINCT member_id), COUNT(check_out),
+       COALESCE(SUM(GREATEST(EXTRACT(EPOCH FROM check_out - check_in), 0)), 0)::bigint
+FROM attendance
+GROUP BY tenant_id, date
+ON CONFLICT (tenant_id, date) DO NOTHING;
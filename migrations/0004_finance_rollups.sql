@@ -0,0 +1,36 @@
+-- Per-tenant finance totals by type and category, at daily and monthly grain.
+-- Kept current by DataManager.add_financial_record and the bulk importer;
+-- uncategorised rows are stored under category ''.
+
+CREATE TABLE IF NOT EXISTS finance_daily (
+    tenant_id INTEGER NOT NULL REFERENCES tenants (id),
+    date DATE NOT NULL,
+    type TEXT NOT NULL,
+    category TEXT NOT NULL DEFAULT '',
+    total NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    entries INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (tenant_id, date, type, category)
+);
+
+CREATE TABLE IF NOT EXISTS finance_monthly (
+    tenant_id INTEGER NOT NULL REFERENCES tenants (id),
+    month DATE NOT NULL,
+    type TEXT NOT NULL,
+    category TEXT NOT NULL DEFAULT '',
+    total NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    entries INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (tenant_id, month, type, category)
+);
+
+-- Backfill from existing finance rows
+INSERT INTO finance_daily (tenant_id, date, type, category, total, entries)
+SELECT tenant_id, date, type, COALESCE(category, ''), SUM(amount), COUNT(*)
+FROM finance
+GROUP BY tenant_id, date, type, COALESCE(category, '')
+ON CONFLICT (tenant_id, date, type, category) DO NOTHING;
+
+INSERT INTO finance_monthly (tenant_id, month, type, category, total, entries)
+SELECT tenant_id, date_trunc('month', date)::date, type, COALESCE(category, ''), SUM(amount), COUNT(*)
+FROM finance
+GROUP BY tenant_id, date_trunc('month', date)::date, type, COALESCE(category, '')
+ON CONFLICT (tenant_id, month, type, category) DO NOTHING;
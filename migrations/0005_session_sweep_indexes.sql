@@ -0,0 +1,4 @@
+-- Let the session sweeper find expired and logged-out rows without scanning the table.
+
+CREATE INDEX IF NOT EXISTS sessions_expires_at_idx ON sessions (expires_at);
+CREATE INDEX IF NOT EXISTS sessions_inactive_idx ON sessions (session_id) WHERE is_active = false;
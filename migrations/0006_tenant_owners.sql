@@ -0,0 +1,17 @@
+-- Record which owner account controls each gym, so reports can cover all of an
+-- owner's gyms at once.
+
+ALTER TABLE tenants ADD COLUMN IF NOT EXISTS owner_id INTEGER REFERENCES users (id);
+
+CREATE INDEX IF NOT EXISTS tenants_owner_id_idx ON tenants (owner_id);
+
+-- Backfill: an owner account attached to a gym owns it (the earliest, if several)
+UPDATE tenants t
+SET owner_id = o.id
+FROM (
+    SELECT DISTINCT ON (tenant_id) id, tenant_id
+    FROM users
+    WHERE role = 'owner' AND tenant_id IS NOT NULL
+    ORDER BY tenant_id, id
+) o
+WHERE t.id = o.tenant_id AND t.owner_id IS NULL;
@@ -0,0 +1,29 @@
+-- Track when dashboard rows last changed so DataManager.refresh_data can fetch
+-- only rows inserted or updated since its previous refresh.
+
+ALTER TABLE members ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE finance ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE attendance ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+
+CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS members_touch_updated_at ON members;
+CREATE TRIGGER members_touch_updated_at BEFORE UPDATE ON members
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+DROP TRIGGER IF EXISTS finance_touch_updated_at ON finance;
+CREATE TRIGGER finance_touch_updated_at BEFORE UPDATE ON finance
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+DROP TRIGGER IF EXISTS attendance_touch_updated_at ON attendance;
+CREATE TRIGGER attendance_touch_updated_at BEFORE UPDATE ON attendance
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+CREATE INDEX IF NOT EXISTS members_tenant_updated_at_idx ON members (tenant_id, updated_at);
+CREATE INDEX IF NOT EXISTS finance_tenant_updated_at_idx ON finance (tenant_id, updated_at);
+CREATE INDEX IF NOT EXISTS attendance_tenant_updated_at_idx ON attendance (tenant_id, updated_at);
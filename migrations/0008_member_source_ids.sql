@@ -0,0 +1,9 @@
+-- Remember each imported member's id in the source system, so attendance and
+-- measurements files imported later (another CLI run, another importer) map
+-- their member_id to the right member instead of reading it as a local id.
+
+ALTER TABLE members ADD COLUMN IF NOT EXISTS source_id BIGINT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS members_tenant_source_id_idx
+    ON members (tenant_id, source_id)
+    WHERE source_id IS NOT NULL;
@@ -7,6 +7,10 @@ st.set_page_config(page_title="Tenant Management", page_icon="🏢")
 # Initialize TenantManager
 tm = TenantManager()
 
+# Gyms created by a logged-in owner are recorded as theirs
+user = st.session_state.get('user')
+owner_id = user['user_id'] if user and user['role'] == 'owner' else None
+
 st.title("Tenant Management")
 
 # Add New Tenant
@@ -23,7 +27,7 @@ with st.form("add_tenant"):
                 st.error("Subdomain can only contain letters, numbers, and hyphens")
             else:
                 try:
-                    tenant = tm.create_tenant(gym_name, subdomain.lower())
+                    tenant = tm.create_tenant(gym_name, subdomain.lower(), owner_id=owner_id)
                     st.success(f"Successfully created gym: {gym_name}")
                     st.info(f"Access URL: {subdomain}.gymflow.com")
                 except Exception as e:
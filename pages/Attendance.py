@@ -2,11 +2,16 @@ import streamlit as st
 from utils.data_manager import DataManager
 from utils.charts import create_attendance_chart
 from utils.page_auth import require_auth
+from utils.member_picker import select_member
+from utils.export_manager import ExportManager, APP_EXPORT_MAX_ROWS, EXPORT_MIME_TYPES, export_formats
+from utils.profiler import start_page
 from datetime import datetime, timedelta
-import pandas as pd
+
+profile = start_page("Attendance")
 
 # Require authentication
-user = require_auth()
+with profile.section("auth"):
+    user = require_auth()
 
 st.set_page_config(page_title="Attendance Management", page_icon="📋")
 
@@ -18,27 +23,20 @@ st.title("Attendance Management")
 # Tabs for different attendance functions
 tab1, tab2 = st.tabs(["Check In/Out", "Attendance Reports"])
 
-with tab1:
+with tab1, profile.section("check in/out"):
     st.header("Member Check In/Out")
     
-    # Load members
-    members_df = dm.get_members()
-    
     col1, col2 = st.columns(2)
     
     with col1:
-        member_id = st.selectbox(
-            "Select Member",
-            options=members_df['id'].tolist(),
-            format_func=lambda x: members_df[members_df['id'] == x]['name'].iloc[0]
-        )
+        member_id = select_member(dm)
         
     with col2:
         action = st.radio("Action", ["Check In", "Check Out"])
     
-    if st.button("Record Attendance"):
+    if st.button("Record Attendance", disabled=member_id is None):
         dm.record_attendance(member_id, action == "Check In")
-        st.success(f"Member {members_df[members_df['id'] == member_id]['name'].iloc[0]} {action.lower()}ed successfully!")
+        st.success(f"Member {dm.get_member_directory()[member_id]} {action.lower()}ed successfully!")
 
 with tab2:
     st.header("Attendance Reports")
@@ -56,58 +54,72 @@ with tab2:
             datetime.now()
         )
     
-    # Load attendance data
-    attendance_df = dm.get_attendance_report(str(start_date), str(end_date))
-    
-    if not attendance_df.empty:
+    # The chart series and statistics come from the attendance rollup
+    with profile.section("load series"):
+        series_df = dm.get_attendance_series(str(start_date), str(end_date))
+
+    if not series_df.empty:
         # Attendance chart
-        st.plotly_chart(create_attendance_chart(attendance_df, members_df), use_container_width=True)
-        
+        with profile.section("build chart"):
+            fig = create_attendance_chart(series_df)
+        with profile.section("render chart"):
+            st.plotly_chart(fig, use_container_width=True)
+
         # Detailed attendance records
         st.subheader("Attendance Records")
-        
-        # Merge with member names
-        detailed_df = pd.merge(
-            attendance_df,
-            members_df[['id', 'name']],
-            left_on='member_id',
-            right_on='id'
-        )
-        
-        st.dataframe(
-            detailed_df[['date', 'name', 'check_in', 'check_out']].sort_values('date', ascending=False),
-            column_config={
-                "date": "Date",
-                "name": "Member Name",
-                "check_in": "Check In Time",
-                "check_out": "Check Out Time"
-            },
-            hide_index=True
-        )
-        
+        with profile.section("load report"):
+            attendance_df = dm.get_attendance_report(str(start_date), str(end_date))
+
+        with profile.section("render table"):
+            st.dataframe(
+                attendance_df[['date', 'member_name', 'check_in', 'check_out']].sort_values('date', ascending=False),
+                column_config={
+                    "date": st.column_config.DateColumn("Date"),
+                    "member_name": "Member Name",
+                    "check_in": "Check In Time",
+                    "check_out": "Check Out Time"
+                },
+                hide_index=True
+            )
+
         # Export functionality
-        st.download_button(
-            label="Export Attendance Report",
-            data=detailed_df.to_csv(index=False),
-            file_name=f"attendance_report_{start_date}_to_{end_date}.csv",
-            mime="text/csv"
-        )
+        export_format = st.radio("Export Format", export_formats(), horizontal=True)
+        if st.button("Prepare Attendance Export"):
+            try:
+                exported = ExportManager(user['tenant_id']).export_attendance(
+                    start_date, end_date, export_format, max_rows=APP_EXPORT_MAX_ROWS
+                )
+            except ValueError as e:
+                st.warning(str(e))
+            else:
+                st.download_button(
+                    label="Export Attendance Report",
+                    data=exported,
+                    file_name=f"attendance_report_{start_date}_to_{end_date}.{export_format}",
+                    mime=EXPORT_MIME_TYPES[export_format]
+                )
     else:
         st.info("No attendance records found for the selected date range.")
 
     # Attendance statistics
     st.subheader("Attendance Statistics")
-    if not attendance_df.empty:
-        col1, col2, col3 = st.columns(3)
-        
+    if not series_df.empty:
+        with profile.section("load stats"):
+            stats = dm.get_attendance_stats(str(start_date), str(end_date))
+        col1, col2, col3, col4 = st.columns(4)
+
         with col1:
-            total_visits = len(attendance_df)
-            st.metric("Total Visits", total_visits)
-            
+            st.metric("Total Visits", stats['total_visits'])
+
         with col2:
-            unique_members = attendance_df['member_id'].nunique()
-            st.metric("Unique Members", unique_members)
-            
+            st.metric("Unique Members", stats['unique_members'])
+
         with col3:
-            avg_daily_visits = total_visits / (end_date - start_date).days
-            st.metric("Average Daily Visits", f"{avg_daily_visits:.1f}")
\ No newline at end of file
+            avg_daily_visits = stats['total_visits'] / ((end_date - start_date).days + 1)
+            st.metric("Average Daily Visits", f"{avg_daily_visits:.1f}")
+
+        with col4:
+            avg_session = stats['avg_session_minutes']
+            st.metric("Average Session", f"{avg_session:.0f} min" if avg_session is not None else "-")
+
+profile.finish()
@@ -2,11 +2,15 @@ import streamlit as st
 from utils.data_manager import DataManager
 from utils.charts import create_financial_chart
 from utils.page_auth import require_auth
-import pandas as pd
+from utils.export_manager import ExportManager, APP_EXPORT_MAX_ROWS, EXPORT_MIME_TYPES, export_formats
+from utils.profiler import start_page
 from datetime import datetime, timedelta
 
+profile = start_page("Finance")
+
 # Require authentication
-user = require_auth()
+with profile.section("auth"):
+    user = require_auth()
 
 st.set_page_config(page_title="Financial Management", page_icon="💰")
 
@@ -55,18 +59,19 @@ with tab1:
 with tab2:
     st.header("Financial Overview")
 
-    # Load financial data
-    finance_df = dm.get_financial_summary()
+    # All-time totals and the chart series come from the finance rollups
+    with profile.section("load totals"):
+        totals_df = dm.get_finance_totals()
 
     # Summary metrics
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        total_income = finance_df[finance_df['type'] == 'income']['amount'].sum()
+        total_income = totals_df[totals_df['type'] == 'income']['amount'].sum()
         st.metric("Total Income", f"${total_income:,.2f}")
 
     with col2:
-        total_expenses = finance_df[finance_df['type'] == 'expense']['amount'].sum()
+        total_expenses = totals_df[totals_df['type'] == 'expense']['amount'].sum()
         st.metric("Total Expenses", f"${total_expenses:,.2f}")
 
     with col3:
@@ -74,21 +79,29 @@ with tab2:
         st.metric("Net Profit", f"${net_profit:,.2f}")
 
     # Financial chart
-    st.plotly_chart(create_financial_chart(finance_df), use_container_width=True)
+    with profile.section("load series"):
+        series_df = dm.get_finance_series()
+    with profile.section("build chart"):
+        fig = create_financial_chart(series_df)
+    with profile.section("render chart"):
+        st.plotly_chart(fig, use_container_width=True)
 
     # Transaction history
     st.subheader("Recent Transactions")
-    st.dataframe(
-        finance_df.sort_values('date', ascending=False).head(10),
-        column_config={
-            "date": "Date",
-            "type": "Type",
-            "category": "Category",
-            "amount": "Amount",
-            "description": "Description"
-        },
-        hide_index=True
-    )
+    with profile.section("load transactions"):
+        transactions_df = dm.get_recent_transactions(10)
+    with profile.section("render transactions"):
+        st.dataframe(
+            transactions_df,
+            column_config={
+                "date": st.column_config.DateColumn("Date"),
+                "type": "Type",
+                "category": "Category",
+                "amount": "Amount",
+                "description": "Description"
+            },
+            hide_index=True
+        )
 
 with tab3:
     st.header("Financial Reports")
@@ -106,30 +119,37 @@ with tab3:
             datetime.now()
         )
 
-    # Filter data by date range
-    filtered_df = finance_df[
-        (finance_df['date'] >= str(start_date)) &
-        (finance_df['date'] <= str(end_date))
-    ]
-
     # Summary by category
     st.subheader("Category Summary")
-    category_summary = filtered_df.groupby(['type', 'category'])['amount'].sum().reset_index()
-    st.dataframe(
-        category_summary,
-        column_config={
-            "type": "Type",
-            "category": "Category",
-            "amount": "Total Amount"
-        },
-        hide_index=True
-    )
+    with profile.section("load category summary"):
+        category_summary = dm.get_finance_totals(str(start_date), str(end_date))
+    with profile.section("render category summary"):
+        st.dataframe(
+            category_summary[['type', 'category', 'amount']],
+            column_config={
+                "type": "Type",
+                "category": "Category",
+                "amount": "Total Amount"
+            },
+            hide_index=True
+        )
 
     # Export functionality
-    if not filtered_df.empty:
-        st.download_button(
-            label="Export Financial Report",
-            data=filtered_df.to_csv(index=False),
-            file_name=f"financial_report_{start_date}_to_{end_date}.csv",
-            mime="text/csv"
-        )
\ No newline at end of file
+    if not category_summary.empty:
+        export_format = st.radio("Export Format", export_formats(), horizontal=True)
+        if st.button("Prepare Financial Export"):
+            try:
+                exported = ExportManager(user['tenant_id']).export_finance(
+                    start_date, end_date, export_format, max_rows=APP_EXPORT_MAX_ROWS
+                )
+            except ValueError as e:
+                st.warning(str(e))
+            else:
+                st.download_button(
+                    label="Export Financial Report",
+                    data=exported,
+                    file_name=f"financial_report_{start_date}_to_{end_date}.{export_format}",
+                    mime=EXPORT_MIME_TYPES[export_format]
+                )
+
+profile.finish()
@@ -1,11 +1,17 @@
 import streamlit as st
 from utils.data_manager import DataManager
-from utils.charts import create_measurement_progress_chart, create_bmi_gauge
+from utils.charts import cached_figures, create_member_progress_figures
 from utils.page_auth import require_auth
+from utils.member_picker import select_member
+from utils.export_manager import ExportManager, EXPORT_MIME_TYPES, export_formats
+from utils.profiler import start_page
 import pandas as pd
 
+profile = start_page("Fitness")
+
 # Require authentication
-user = require_auth()
+with profile.section("auth"):
+    user = require_auth()
 
 st.set_page_config(page_title="Fitness Tracking", page_icon="📊")
 
@@ -14,15 +20,11 @@ dm = DataManager(user['tenant_id'])
 
 st.title("Fitness Tracking")
 
-# Load members for selection
-members_df = dm.get_members()
-
 # Member selection
-member_id = st.selectbox(
-    "Select Member",
-    options=members_df['id'].tolist(),
-    format_func=lambda x: members_df[members_df['id'] == x]['name'].iloc[0]
-)
+with profile.section("select member"):
+    member_id = select_member(dm)
+if member_id is None:
+    st.stop()
 
 # Tabs for different fitness tracking functions
 tab1, tab2 = st.tabs(["Record Measurements", "Progress Tracking"])
@@ -62,32 +64,32 @@ with tab1:
 with tab2:
     st.header("Progress Tracking")
 
-    # Load measurements for selected member
-    measurements_df = dm.get_measurements(member_id)
+    # Figures are cached per version of the member's history, so repeat
+    # views skip both the measurements query and building the figures
+    with profile.section("load version"):
+        latest_date, measurement_count = dm.get_measurement_version(member_id)
 
-    if not measurements_df.empty:
-        # Latest measurements
-        latest_measurements = measurements_df.iloc[-1]
-
-        # BMI Gauge
-        st.subheader("Current BMI")
-        st.plotly_chart(create_bmi_gauge(latest_measurements['bmi']), use_container_width=True)
+    if measurement_count:
+        with profile.section("build charts"):
+            figures = cached_figures(
+                (user['tenant_id'], member_id, latest_date, measurement_count),
+                lambda: create_member_progress_figures(dm.get_measurements(member_id))
+            )
 
-        # Progress charts
-        metrics = ['weight', 'chest', 'waist', 'arms', 'legs']
+        with profile.section("render charts"):
+            # BMI Gauge
+            st.subheader("Current BMI")
+            st.plotly_chart(figures['bmi'], use_container_width=True)
 
-        for metric in metrics:
-            st.plotly_chart(
-                create_measurement_progress_chart(measurements_df, metric),
-                use_container_width=True
-            )
+            # Progress chart
+            st.plotly_chart(figures['progress'], use_container_width=True)
 
         # Measurements history
         st.subheader("Measurements History")
         st.dataframe(
-            measurements_df.sort_values('date', ascending=False),
+            dm.get_measurements(member_id).sort_values('date', ascending=False),
             column_config={
-                "date": "Date",
+                "date": st.column_config.DateColumn("Date"),
                 "weight": "Weight (kg)",
                 "height": "Height (cm)",
                 "chest": "Chest (cm)",
@@ -100,11 +102,15 @@ with tab2:
         )
 
         # Export functionality
-        st.download_button(
-            label="Export Measurements History",
-            data=measurements_df.to_csv(index=False),
-            file_name=f"measurements_history_member_{member_id}.csv",
-            mime="text/csv"
-        )
+        export_format = st.radio("Export Format", export_formats(), horizontal=True)
+        if st.button("Prepare Measurements Export"):
+            st.download_button(
+                label="Export Measurements History",
+                data=ExportManager(user['tenant_id']).export_measurements(member_id, export_format),
+                file_name=f"measurements_history_member_{member_id}.{export_format}",
+                mime=EXPORT_MIME_TYPES[export_format]
+            )
     else:
-        st.info("No measurements recorded for this member yet.")
\ No newline at end of file
+        st.info("No measurements recorded for this member yet.")
+
+profile.finish()
@@ -1,10 +1,15 @@
 import streamlit as st
 from utils.data_manager import DataManager
 from utils.page_auth import require_auth
+from utils.export_manager import ExportManager, APP_EXPORT_MAX_ROWS, EXPORT_MIME_TYPES, export_formats
+from utils.profiler import start_page
 import pandas as pd
 
+profile = start_page("Members")
+
 # Require authentication
-user = require_auth()
+with profile.section("auth"):
+    user = require_auth()
 
 st.set_page_config(page_title="Member Management", page_icon="👥")
 
@@ -13,6 +18,8 @@ dm = DataManager(user['tenant_id'])
 
 st.title("Member Management")
 
+PAGE_SIZE = 50
+
 # Tabs for different member management functions
 tab1, tab2 = st.tabs(["Add Member", "View/Edit Members"])
 
@@ -56,81 +63,115 @@ with tab1:
 
 with tab2:
     st.header("View/Edit Members")
-    
-    # Load and display members
-    members_df = dm.get_members()
-    
+
     # Search and filter
     search_term = st.text_input("Search Members", "")
+    # Statuses actually in use, so imported values and members without one stay visible
+    member_statuses = dm.get_member_statuses()
     status_filter = st.multiselect(
         "Filter by Status",
-        options=members_df['status'].unique(),
-        default=members_df['status'].unique()
+        options=member_statuses,
+        default=member_statuses,
+        format_func=lambda status: "(no status)" if status is None else status
     )
-    
-    # Filter dataframe
-    filtered_df = members_df[
-        (members_df['name'].str.contains(search_term, case=False, na=False)) &
-        (members_df['status'].isin(status_filter))
-    ]
-    
+
+    # Restart paging whenever the search criteria change
+    search_key = (search_term, tuple(status_filter))
+    if st.session_state.get('member_search_key') != search_key:
+        st.session_state.member_search_key = search_key
+        st.session_state.member_page_cursors = [0]
+    page_cursors = st.session_state.member_page_cursors
+
+    # Load one keyset page of matching members
+    with profile.section("load members"):
+        page_df = dm.search_members(
+            search_term,
+            status_filter,
+            after_id=page_cursors[-1],
+            limit=PAGE_SIZE
+        )
+
     # Display members table
-    st.dataframe(
-        filtered_df,
-        column_config={
-            "id": "Member ID",
-            "name": "Name",
-            "email": "Email",
-            "phone": "Phone",
-            "join_date": "Join Date",
-            "membership_type": "Membership",
-            "status": "Status",
-            "emergency_contact": "Emergency Contact"
-        },
-        hide_index=True
-    )
-    
+    with profile.section("render table"):
+        st.dataframe(
+            page_df,
+            column_config={
+                "id": "Member ID",
+                "name": "Name",
+                "email": "Email",
+                "phone": "Phone",
+                "join_date": st.column_config.DateColumn("Join Date"),
+                "membership_type": "Membership",
+                "status": "Status",
+                "emergency_contact": "Emergency Contact"
+            },
+            hide_index=True
+        )
+
+    prev_col, page_col, next_col = st.columns(3)
+    with prev_col:
+        if st.button("Previous", disabled=len(page_cursors) == 1):
+            page_cursors.pop()
+            st.rerun()
+    with page_col:
+        st.caption(f"Page {len(page_cursors)}")
+    with next_col:
+        if st.button("Next", disabled=len(page_df) < PAGE_SIZE):
+            page_cursors.append(int(page_df['id'].iloc[-1]))
+            st.rerun()
+
     # Edit member
     st.subheader("Edit Member")
-    member_to_edit = st.number_input("Enter Member ID to edit", min_value=1, max_value=len(members_df) if len(members_df) > 0 else 1)
-    
+    member_to_edit = st.number_input("Enter Member ID to edit", min_value=1)
+
     if st.button("Load Member Details"):
-        member_data = members_df[members_df['id'] == member_to_edit].iloc[0]
-        
-        with st.form("edit_member"):
-            name = st.text_input("Name", value=member_data['name'])
-            email = st.text_input("Email", value=member_data['email'])
-            phone = st.text_input("Phone", value=member_data['phone'])
-            membership_type = st.selectbox(
-                "Membership Type",
-                ["Basic", "Premium", "VIP"],
-                index=["Basic", "Premium", "VIP"].index(member_data['membership_type'])
-            )
-            status = st.selectbox(
-                "Status",
-                ["Active", "Inactive"],
-                index=["Active", "Inactive"].index(member_data['status'])
-            )
-            emergency_contact = st.text_input("Emergency Contact", value=member_data['emergency_contact'])
+        member_data = dm.get_member(member_to_edit)
+
+        if member_data is None:
+            st.error("Member not found")
+        else:
+            with st.form("edit_member"):
+                name = st.text_input("Name", value=member_data['name'])
+                email = st.text_input("Email", value=member_data['email'])
+                phone = st.text_input("Phone", value=member_data['phone'])
+                membership_type = st.selectbox(
+                    "Membership Type",
+                    ["Basic", "Premium", "VIP"],
+                    index=["Basic", "Premium", "VIP"].index(member_data['membership_type'])
+                )
+                status = st.selectbox(
+                    "Status",
+                    ["Active", "Inactive"],
+                    index=["Active", "Inactive"].index(member_data['status'])
+                )
+                emergency_contact = st.text_input("Emergency Contact", value=member_data['emergency_contact'])
             
-            if st.form_submit_button("Update Member"):
-                updated_data = {
-                    'name': name,
-                    'email': email,
-                    'phone': phone,
-                    'membership_type': membership_type,
-                    'status': status,
-                    'emergency_contact': emergency_contact
-                }
-                dm.update_member(member_to_edit, updated_data)
-                st.success("Member details updated successfully!")
-                st.experimental_rerun()
+                if st.form_submit_button("Update Member"):
+                    updated_data = {
+                        'name': name,
+                        'email': email,
+                        'phone': phone,
+                        'membership_type': membership_type,
+                        'status': status,
+                        'emergency_contact': emergency_contact
+                    }
+                    dm.update_member(member_to_edit, updated_data)
+                    st.success("Member details updated successfully!")
+                    st.experimental_rerun()
 
 # Export functionality
-if not members_df.empty:
-    st.download_button(
-        label="Export Members Data",
-        data=members_df.to_csv(index=False),
-        file_name="members_export.csv",
-        mime="text/csv"
-    )
\ No newline at end of file
+export_format = st.radio("Export Format", export_formats(), horizontal=True)
+if st.button("Prepare Members Export"):
+    try:
+        exported = ExportManager(user['tenant_id']).export_members(export_format, max_rows=APP_EXPORT_MAX_ROWS)
+    except ValueError as e:
+        st.warning(str(e))
+    else:
+        st.download_button(
+            label="Export Members Data",
+            data=exported,
+            file_name=f"members_export.{export_format}",
+            mime=EXPORT_MIME_TYPES[export_format]
+        )
+
+profile.finish()
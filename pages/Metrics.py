@@ -0,0 +1,109 @@
+import os
+import streamlit as st
+import pandas as pd
+from utils.db_pool import pool_stats
+from utils.metrics import get_metrics
+from utils.page_auth import require_auth
+from utils.query_cache import cache_stats
+from utils.read_routing import get_read_router
+from utils.profiler import start_page
+from utils.tenant_manager import TenantManager
+
+profile = start_page("Metrics")
+
+# Require authentication
+with profile.section("auth"):
+    user = require_auth()
+
+st.set_page_config(page_title="Metrics", page_icon="📈", layout="wide")
+
+if user['role'] != 'owner':
+    st.error("Only gym owners can view system metrics.")
+    st.stop()
+
+st.title("Query Metrics")
+st.caption("Calls made on behalf of your gyms, recorded by this server process since it started or was last reset.")
+
+# Only the owner's own gyms; calls for other tenants and unscoped managers stay hidden
+with profile.section("load metrics"):
+    registry = get_metrics()
+    owned = {str(tenant['id']) for tenant in TenantManager().list_owner_tenants(user['user_id'])}
+    if user.get('tenant_id') is not None:
+        owned.add(str(user['tenant_id']))
+    snapshot = [entry for entry in registry.snapshot() if entry['tenant'] in owned]
+
+if not snapshot:
+    st.info("No manager calls have been recorded yet.")
+else:
+    metrics_df = pd.DataFrame([
+        {
+            'manager': entry['manager'],
+            'method': entry['method'],
+            'tenant': entry['tenant'],
+            'calls': entry['calls'],
+            'errors': entry['errors'],
+            'mean_ms': entry['seconds'] / entry['calls'] * 1000,
+            'p50_ms': registry.quantile(entry['buckets'], 0.5) * 1000,
+            'p95_ms': registry.quantile(entry['buckets'], 0.95) * 1000,
+            'total_s': entry['seconds'],
+            'rows': entry['rows'],
+            'bytes': entry['bytes'],
+        }
+        for entry in snapshot
+    ])
+
+    col1, col2 = st.columns(2)
+    with col1:
+        managers = st.multiselect("Manager", sorted(metrics_df['manager'].unique()))
+    with col2:
+        tenants = st.multiselect("Tenant", sorted(metrics_df['tenant'].unique()))
+    if managers:
+        metrics_df = metrics_df[metrics_df['manager'].isin(managers)]
+    if tenants:
+        metrics_df = metrics_df[metrics_df['tenant'].isin(tenants)]
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Calls", f"{metrics_df['calls'].sum():,}")
+    with col2:
+        st.metric("Errors", f"{metrics_df['errors'].sum():,}")
+    with col3:
+        st.metric("Time in Managers", f"{metrics_df['total_s'].sum():,.1f} s")
+
+    st.subheader("Methods by Total Time")
+    st.dataframe(
+        metrics_df.sort_values('total_s', ascending=False),
+        column_config={
+            "manager": "Manager",
+            "method": "Method",
+            "tenant": "Tenant",
+            "calls": "Calls",
+            "errors": "Errors",
+            "mean_ms": st.column_config.NumberColumn("Mean (ms)", format="%.2f"),
+            "p50_ms": st.column_config.NumberColumn("p50 (ms)", format="%.2f"),
+            "p95_ms": st.column_config.NumberColumn("p95 (ms)", format="%.2f"),
+            "total_s": st.column_config.NumberColumn("Total (s)", format="%.3f"),
+            "rows": "Rows",
+            "bytes": "Bytes"
+        },
+        hide_index=True
+    )
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.subheader("Connection Pool")
+    st.json(pool_stats())
+with col2:
+    st.subheader("Query Cache")
+    st.json(cache_stats())
+with col3:
+    st.subheader("Read Routing")
+    st.json(get_read_router().stats())
+
+port = os.environ.get('METRICS_PORT')
+if port:
+    st.caption(f"Prometheus endpoint: http://{os.environ.get('METRICS_ADDR', '127.0.0.1')}:{port}/metrics")
+else:
+    st.caption("Set METRICS_PORT to expose these metrics to Prometheus.")
+
+profile.finish()
@@ -0,0 +1,82 @@
+import streamlit as st
+from utils.tenant_manager import TenantManager
+from utils.charts import create_portfolio_chart
+from utils.page_auth import require_auth
+from utils.profiler import start_page
+from datetime import datetime, timedelta
+
+profile = start_page("Portfolio")
+
+# Require authentication
+with profile.section("auth"):
+    user = require_auth()
+
+st.set_page_config(page_title="Gym Portfolio", page_icon="🏋️", layout="wide")
+
+if user['role'] != 'owner':
+    st.error("Only gym owners can view the portfolio.")
+    st.stop()
+
+tm = TenantManager()
+
+st.title("Gym Portfolio")
+
+# Date range selection
+col1, col2 = st.columns(2)
+with col1:
+    start_date = st.date_input(
+        "Start Date",
+        datetime.now() - timedelta(days=30)
+    )
+with col2:
+    end_date = st.date_input(
+        "End Date",
+        datetime.now()
+    )
+
+# Every gym the owner controls, aggregated in one query
+with profile.section("load summary"):
+    summary_df = tm.get_owner_summary(user['user_id'], str(start_date), str(end_date))
+
+if summary_df.empty:
+    st.info("You don't own any gyms yet. Create one on the Tenant Management page.")
+else:
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Gyms", len(summary_df))
+
+    with col2:
+        st.metric("Active Members", f"{summary_df['active_members'].sum():,}")
+
+    with col3:
+        st.metric("Visits", f"{summary_df['visits'].sum():,}")
+
+    with col4:
+        st.metric("Net Revenue", f"${summary_df['net'].sum():,.2f}")
+
+    with profile.section("build chart"):
+        fig = create_portfolio_chart(summary_df)
+    with profile.section("render chart"):
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Gyms")
+    with profile.section("render table"):
+        st.dataframe(
+            summary_df.drop(columns=['tenant_id']),
+            column_config={
+                "name": "Gym",
+                "subdomain": "Subdomain",
+                "status": "Status",
+                "total_members": "Members",
+                "active_members": "Active",
+                "new_members": "New",
+                "visits": "Visits",
+                "income": st.column_config.NumberColumn("Income", format="$%.2f"),
+                "expenses": st.column_config.NumberColumn("Expenses", format="$%.2f"),
+                "net": st.column_config.NumberColumn("Net", format="$%.2f")
+            },
+            hide_index=True
+        )
+
+profile.finish()
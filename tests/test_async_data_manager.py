@@ -0,0 +1,37 @@
+import os
+from datetime import date, timedelta
+import pytest
+
+asyncpg = pytest.importorskip('asyncpg')
+
+from utils.async_data_manager import AsyncDataManager, run_sync
+from utils.data_manager import DataManager
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get('DATABASE_URL'), reason="needs DATABASE_URL pointing at a migrated database"
+)
+
+TENANT_ID = int(os.environ.get('TEST_TENANT_ID', 1))
+
+def _range():
+    end = date.today()
+    return str(end - timedelta(days=30)), str(end)
+
+@pytest.mark.parametrize('method', [
+    'get_attendance_daily',
+    'get_attendance_series',
+    'get_attendance_stats',
+    'get_attendance_report',
+    'get_finance_totals',
+    'get_finance_series',
+])
+def test_string_dates_match_sync_manager(method):
+    """ISO date strings, as the pages pass them, work with both managers."""
+    start, end = _range()
+    sync_result = getattr(DataManager(TENANT_ID), method)(start, end)
+    async_result = run_sync(getattr(AsyncDataManager(TENANT_ID), method)(start, end))
+    if isinstance(sync_result, dict):
+        assert async_result == sync_result
+    else:
+        assert list(async_result.columns) == list(sync_result.columns)
+        assert len(async_result) == len(sync_result)
@@ -0,0 +1,587 @@
+import asyncio
+import os
+import re
+import threading
+import pandas as pd
+from datetime import date, datetime
+from utils.data_manager import (
+    ACTIVE_MEMBER_STATUS, CHECK_IN_SQL, CHECK_OUT_SQL, FINANCE_TOTALS_SQL, group_attendance_events,
+    month_span
+)
+from utils.query_cache import async_cached_query, invalidate_tables
+from utils.read_routing import get_read_router
+from utils.chart_data import MAX_CHART_POINTS, choose_bucket, downsample
+from utils.metrics import instrument
+from utils.result_loader import build_frame
+from utils.rollups import FINANCE_DAILY_SQL, FINANCE_MONTHLY_SQL, finance_rollup_params
+
+try:
+    import asyncpg
+except ImportError:  # The async data layer is optional
+    asyncpg = None
+
+_NAMED_PARAM = re.compile(r'%\((\w+)\)s')
+
+def _positional(sql: str, params: dict) -> tuple:
+    """Rewrite ``%(name)s`` placeholders shared with DataManager as ``$n`` for asyncpg."""
+    names = []
+
+    def replace(match):
+        name = match.group(1)
+        if name not in names:
+            names.append(name)
+        return f"${names.index(name) + 1}"
+
+    return _NAMED_PARAM.sub(replace, sql), [params[name] for name in names]
+
+def _as_date(value):
+    """Coerce a date bound to ``datetime.date``; asyncpg, unlike psycopg2, rejects ISO strings."""
+    return None if value is None else pd.Timestamp(value).date()
+
+# asyncpg pools are bound to the event loop that created them
+_pools = {}
+_pools_lock = threading.Lock()
+
+async def _create_pool():
+    return await asyncpg.create_pool(
+        os.environ['DATABASE_URL'],
+        min_size=int(os.environ.get('DB_POOL_MIN', 1)),
+        max_size=int(os.environ.get('DB_POOL_MAX', 10)),
+    )
+
+async def get_async_pool():
+    """Get the asyncpg pool for the running event loop, creating it on first use.
+
+    Sized with the same ``DB_POOL_MIN`` / ``DB_POOL_MAX`` settings as the
+    synchronous pool.
+    """
+    if asyncpg is None:
+        raise ImportError("asyncpg is required for the async data layer (install the 'async' extra)")
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        pool = _pools.get(loop)
+        if pool is None:
+            # Store the creating task so concurrent callers await the same pool
+            pool = _pools[loop] = loop.create_task(_create_pool())
+    try:
+        return await pool
+    except Exception:
+        with _pools_lock:
+            if _pools.get(loop) is pool:
+                del _pools[loop]
+        raise
+
+async def close_async_pool():
+    """Close the running loop's pool so the next ``get_async_pool()`` builds a fresh one."""
+    with _pools_lock:
+        pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await (await pool).close()
+
+_loop = None
+_loop_lock = threading.Lock()
+
+def run_sync(coro):
+    """Run a coroutine from synchronous code, such as a Streamlit page, and return its result.
+
+    Coroutines run on one long-lived background event loop, so its pool
+    and connections are reused across calls and reruns.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='async-data-loop', daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+@instrument
+class AsyncDataManager:
+    """Tenant-scoped data access on asyncpg, mirroring ``DataManager``.
+
+    Every method is a coroutine, so independent reads can be awaited
+    together (``get_data`` does this) and long report queries do not block
+    the calling thread. Results are shaped and cached like DataManager's.
+    ``get_data`` always loads in full; the incremental refresh and the
+    concurrent fan-out helpers are sync-only. From synchronous code, wrap
+    calls in ``run_sync``.
+    """
+
+    def __init__(self, tenant_id: int = None):
+        if asyncpg is None:
+            raise ImportError("asyncpg is required for AsyncDataManager (install the 'async' extra)")
+        self.tenant_id = tenant_id
+        self.router = get_read_router()
+
+    def _check_tenant(self):
+        """Ensure tenant_id is set before operations."""
+        if not self.tenant_id:
+            raise ValueError("Tenant ID is required for this operation")
+
+    def _written(self, *tables):
+        """After a commit: pin this tenant's reads to the primary, then drop cached reads."""
+        self.router.note_write(self.tenant_id)
+        invalidate_tables(self.tenant_id, *tables)
+
+    async def _fetch_df(self, query: str, *args) -> pd.DataFrame:
+        """Run a query and load the rows into typed columns, as DataManager does."""
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            statement = await conn.prepare(query)
+            rows = await statement.fetch(*args)
+            columns = [(attribute.name, attribute.type.oid) for attribute in statement.get_attributes()]
+        return build_frame(columns, rows)
+
+    async def _fetchrow(self, query: str, *args):
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            return await conn.fetchrow(query, *args)
+
+    async def add_member(self, member_data: dict) -> int:
+        """Add a new member for the current tenant."""
+        self._check_tenant()
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            member_id = await conn.fetchval(
+                """
+                INSERT INTO members (
+                    tenant_id, name, email, phone,
+                    membership_type, status, emergency_contact
+                ) VALUES (
+                    $1, $2, $3, $4, $5, $6, $7
+                ) RETURNING id
+                """,
+                self.tenant_id, member_data['name'], member_data['email'],
+                member_data['phone'], member_data['membership_type'],
+                member_data['status'], member_data['emergency_contact']
+            )
+        self._written('members')
+        return member_id
+
+    @async_cached_query('members')
+    async def get_members(self) -> pd.DataFrame:
+        """Get all members for the current tenant."""
+        return await self._fetch_df(
+            """
+            SELECT id, name, email, phone, join_date,
+                   membership_type, status, emergency_contact
+            FROM members
+            WHERE tenant_id = $1
+            """,
+            self.tenant_id
+        )
+
+    @async_cached_query('members')
+    async def get_member(self, member_id: int) -> dict:
+        """Get a single member of the current tenant, or None if not found."""
+        row = await self._fetchrow(
+            """
+            SELECT id, name, email, phone, join_date,
+                   membership_type, status, emergency_contact
+            FROM members
+            WHERE tenant_id = $1 AND id = $2
+            """,
+            self.tenant_id, member_id
+        )
+        return dict(row) if row else None
+
+    @async_cached_query('members')
+    async def get_member_directory(self) -> dict:
+        """Get an id -> name map of the tenant's members, ordered by name."""
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT id, name
+                FROM members
+                WHERE tenant_id = $1
+                ORDER BY name, id
+                """,
+                self.tenant_id
+            )
+        return {row['id']: row['name'] for row in rows}
+
+    @async_cached_query('members')
+    async def get_member_statuses(self) -> list:
+        """Get the distinct member statuses in use, including None for members without one."""
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT DISTINCT status
+                FROM members
+                WHERE tenant_id = $1
+                ORDER BY status NULLS LAST
+                """,
+                self.tenant_id
+            )
+        return [row['status'] for row in rows]
+
+    @async_cached_query('members')
+    async def lookup_members(self, prefix: str, limit: int = 20) -> tuple:
+        """Get up to ``limit`` (id, name) pairs whose name starts with ``prefix``, for type-ahead."""
+        prefix = (prefix or '').strip()
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT id, name
+                FROM members
+                WHERE tenant_id = $1 AND lower(name) LIKE lower($2)
+                ORDER BY lower(name), id
+                LIMIT $3
+                """,
+                self.tenant_id, f"{escaped}%", limit
+            )
+        return tuple((row['id'], row['name']) for row in rows)
+
+    @async_cached_query('members')
+    async def search_members(self, query: str = '', statuses: list = None,
+                             after_id: int = 0, limit: int = 50) -> pd.DataFrame:
+        """Search members by name, one keyset page at a time (see ``DataManager.search_members``)."""
+        sql = """
+            SELECT id, name, email, phone, join_date,
+                   membership_type, status, emergency_contact
+            FROM members
+            WHERE tenant_id = $1 AND id > $2
+        """
+        args = [self.tenant_id, after_id or 0]
+
+        query = (query or '').strip()
+        if query:
+            escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            if len(query) < 3:
+                args.append(f"{escaped}%")
+                sql += f" AND lower(name) LIKE lower(${len(args)})"
+            else:
+                args.append(f"%{escaped}%")
+                sql += f" AND name ILIKE ${len(args)}"
+
+        if statuses is not None:
+            statuses = list(statuses)
+            args.append([status for status in statuses if status is not None])
+            if None in statuses:
+                sql += f" AND (status = ANY(${len(args)}) OR status IS NULL)"
+            else:
+                sql += f" AND status = ANY(${len(args)})"
+
+        args.append(limit)
+        sql += f" ORDER BY id LIMIT ${len(args)}"
+        return await self._fetch_df(sql, *args)
+
+    async def update_member(self, member_id: int, updated_data: dict):
+        """Update member details."""
+        self._check_tenant()
+        fields = ', '.join(f"{k} = ${i}" for i, k in enumerate(updated_data.keys(), start=3))
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                f"""
+                UPDATE members
+                SET {fields}
+                WHERE tenant_id = $1 AND id = $2
+                """,
+                self.tenant_id, member_id, *updated_data.values()
+            )
+        self._written('members')
+
+    async def record_attendance(self, member_id: int, check_in: bool = True):
+        """Record member attendance."""
+        await self.record_attendance_batch([
+            {'member_id': member_id, 'check_in': check_in, 'timestamp': datetime.now()}
+        ])
+
+    async def record_attendance_batch(self, events: list):
+        """Record many check-ins and check-outs in one transaction (see ``DataManager``)."""
+        self._check_tenant()
+        if not events:
+            return
+
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                for check_in, rows in group_attendance_events(events):
+                    member_ids, dates, times = (list(column) for column in zip(*rows))
+                    sql, args = _positional(CHECK_IN_SQL if check_in else CHECK_OUT_SQL, {
+                        'tenant_id': self.tenant_id, 'member_ids': member_ids,
+                        'dates': dates, 'times': times,
+                    })
+                    await conn.execute(sql, *args)
+        self._written('attendance')
+
+    @async_cached_query('attendance')
+    async def get_attendance_daily(self, start_date=None, end_date=None) -> pd.DataFrame:
+        """Get per-day visits, unique members and average session length from the rollup."""
+        query = """
+            SELECT date, visits, unique_members,
+                   CASE WHEN completed_visits > 0
+                        THEN total_session_seconds / completed_visits / 60.0
+                   END AS avg_session_minutes
+            FROM attendance_daily
+            WHERE tenant_id = $1
+        """
+        args = [self.tenant_id]
+
+        if start_date and end_date:
+            query += " AND date BETWEEN $2 AND $3"
+            args.extend([_as_date(start_date), _as_date(end_date)])
+        query += " ORDER BY date"
+        return await self._fetch_df(query, *args)
+
+    @async_cached_query('attendance')
+    async def get_attendance_series(self, start_date=None, end_date=None,
+                                    max_points: int = MAX_CHART_POINTS) -> pd.DataFrame:
+        """Get visits per day, week or month for charting (see ``DataManager.get_attendance_series``)."""
+        start, end = await self._rollup_range('attendance_daily', start_date, end_date)
+        bucket = choose_bucket(start, end, max_points)
+        df = await self._fetch_df(
+            """
+            SELECT date_trunc($2, date)::date AS date, SUM(visits) AS visits
+            FROM attendance_daily
+            WHERE tenant_id = $1 AND date BETWEEN $3 AND $4
+            GROUP BY 1
+            ORDER BY 1
+            """,
+            self.tenant_id, bucket, start, end
+        )
+        df = downsample(df, 'date', 'visits', max_points)
+        df.attrs['bucket'] = bucket
+        return df
+
+    @async_cached_query('attendance')
+    async def get_attendance_stats(self, start_date, end_date) -> dict:
+        """Get visit totals for a date range from the rollup, plus distinct visitors."""
+        row = await self._fetchrow(
+            """
+            SELECT
+                (SELECT COALESCE(SUM(visits), 0) FROM attendance_daily
+                 WHERE tenant_id = $1 AND date BETWEEN $2 AND $3) AS total_visits,
+                (SELECT COALESCE(SUM(total_session_seconds), 0) / NULLIF(SUM(completed_visits), 0) / 60.0
+                 FROM attendance_daily
+                 WHERE tenant_id = $1 AND date BETWEEN $2 AND $3) AS avg_session_minutes,
+                (SELECT COUNT(DISTINCT member_id) FROM attendance
+                 WHERE tenant_id = $1 AND date BETWEEN $2 AND $3) AS unique_members
+            """,
+            self.tenant_id, _as_date(start_date), _as_date(end_date)
+        )
+        return {
+            'total_visits': int(row['total_visits']),
+            'unique_members': row['unique_members'],
+            'avg_session_minutes': (
+                float(row['avg_session_minutes']) if row['avg_session_minutes'] is not None else None
+            )
+        }
+
+    @async_cached_query('attendance', 'members')
+    async def get_attendance_report(self, start_date=None, end_date=None) -> pd.DataFrame:
+        """Get attendance report for the current tenant."""
+        query = """
+            SELECT a.date, a.check_in, a.check_out, m.name as member_name
+            FROM attendance a
+            JOIN members m ON a.member_id = m.id
+            WHERE a.tenant_id = $1
+        """
+        args = [self.tenant_id]
+
+        if start_date and end_date:
+            query += " AND a.date BETWEEN $2 AND $3"
+            args.extend([_as_date(start_date), _as_date(end_date)])
+        return await self._fetch_df(query, *args)
+
+    async def add_financial_record(self, record_data: dict):
+        """Add a financial record for the current tenant."""
+        self._check_tenant()
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                row = await conn.fetchrow(
+                    """
+                    INSERT INTO finance (
+                        tenant_id, date, type, category, amount, description
+                    ) VALUES ($1, CURRENT_DATE, $2, $3, $4, $5)
+                    RETURNING date, type, category, amount
+                    """,
+                    self.tenant_id, record_data['type'], record_data['category'],
+                    record_data['amount'], record_data['description']
+                )
+                params = finance_rollup_params(self.tenant_id, [(*row, 1)])
+                for rollup_sql in (FINANCE_DAILY_SQL, FINANCE_MONTHLY_SQL):
+                    sql, args = _positional(rollup_sql, params)
+                    await conn.execute(sql, *args)
+        self._written('finance')
+
+    @async_cached_query('finance')
+    async def get_financial_summary(self) -> pd.DataFrame:
+        """Get financial summary for the current tenant."""
+        return await self._fetch_df(
+            """
+            SELECT date, type, category, amount, description
+            FROM finance
+            WHERE tenant_id = $1
+            ORDER BY date DESC
+            """,
+            self.tenant_id
+        )
+
+    @async_cached_query('finance')
+    async def get_recent_transactions(self, limit: int = 10) -> pd.DataFrame:
+        """Get the latest financial records for the current tenant."""
+        return await self._fetch_df(
+            """
+            SELECT date, type, category, amount, description
+            FROM finance
+            WHERE tenant_id = $1
+            ORDER BY date DESC, id DESC
+            LIMIT $2
+            """,
+            self.tenant_id, limit
+        )
+
+    @async_cached_query('finance')
+    async def get_finance_totals(self, start_date=None, end_date=None) -> pd.DataFrame:
+        """Get totals by type and category for a date range from the finance rollups."""
+        start, end, months_start, months_end = month_span(start_date, end_date)
+        sql, args = _positional(FINANCE_TOTALS_SQL, {
+            'tenant_id': self.tenant_id,
+            'start': start,
+            'end': end,
+            'months_start': months_start,
+            'months_end': months_end,
+        })
+        return await self._fetch_df(sql, *args)
+
+    @async_cached_query('finance')
+    async def get_finance_series(self, start_date=None, end_date=None,
+                                 max_points: int = MAX_CHART_POINTS) -> pd.DataFrame:
+        """Get income and expense per day, week or month for charting (see ``DataManager.get_finance_series``)."""
+        start, end = await self._rollup_range('finance_daily', start_date, end_date)
+        bucket = choose_bucket(start, end, max_points)
+        df = await self._fetch_df(
+            """
+            SELECT date_trunc($2, date)::date AS date, type, SUM(total) AS amount
+            FROM finance_daily
+            WHERE tenant_id = $1 AND date BETWEEN $3 AND $4
+            GROUP BY 1, 2
+            ORDER BY 2, 1
+            """,
+            self.tenant_id, bucket, start, end
+        )
+        df = downsample(df, 'date', 'amount', max_points, group='type')
+        df.attrs['bucket'] = bucket
+        return df
+
+    async def _rollup_range(self, table: str, start_date=None, end_date=None) -> tuple:
+        """Resolve a chart's date range, defaulting to the dates present in a rollup."""
+        if start_date and end_date:
+            return _as_date(start_date), _as_date(end_date)
+        row = await self._fetchrow(
+            f"SELECT MIN(date) AS first, MAX(date) AS last FROM {table} WHERE tenant_id = $1",
+            self.tenant_id
+        )
+        today = date.today()
+        return row['first'] or today, row['last'] or today
+
+    async def add_measurements(self, measurement_data: dict):
+        """Add measurements for a member."""
+        self._check_tenant()
+        height_m = measurement_data['height'] / 100
+        bmi = measurement_data['weight'] / (height_m * height_m)
+
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                """
+                INSERT INTO measurements (
+                    tenant_id, member_id, date, weight, height,
+                    chest, waist, arms, legs, bmi
+                ) VALUES ($1, $2, CURRENT_DATE, $3, $4, $5, $6, $7, $8, $9)
+                """,
+                self.tenant_id, measurement_data['member_id'],
+                measurement_data['weight'], measurement_data['height'],
+                measurement_data['chest'], measurement_data['waist'],
+                measurement_data['arms'], measurement_data['legs'], bmi
+            )
+        self._written('measurements')
+
+    @async_cached_query('measurements')
+    async def get_measurements(self, member_id: int) -> pd.DataFrame:
+        """Get measurements history for a member."""
+        return await self._fetch_df(
+            """
+            SELECT date, weight, height, chest, waist, arms, legs, bmi
+            FROM measurements
+            WHERE tenant_id = $1 AND member_id = $2
+            ORDER BY date
+            """,
+            self.tenant_id, member_id
+        )
+
+    @async_cached_query('measurements')
+    async def get_measurement_version(self, member_id: int) -> tuple:
+        """Get (latest measurement date, number of measurements) for a member."""
+        row = await self._fetchrow(
+            """
+            SELECT MAX(date) AS latest, COUNT(*) AS count
+            FROM measurements
+            WHERE tenant_id = $1 AND member_id = $2
+            """,
+            self.tenant_id, member_id
+        )
+        return row['latest'], row['count']
+
+    @async_cached_query('members', 'attendance', 'finance')
+    async def get_dashboard_metrics(self) -> dict:
+        """Get the dashboard KPIs for the current tenant in a single round-trip."""
+        row = await self._fetchrow(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM members
+                 WHERE tenant_id = $1) AS total_members,
+                (SELECT COUNT(*) FROM members
+                 WHERE tenant_id = $1 AND status = $3) AS active_members,
+                (SELECT COALESCE(SUM(visits), 0) FROM attendance_daily
+                 WHERE tenant_id = $1 AND date = $2) AS todays_attendance,
+                (SELECT COALESCE(SUM(total), 0) FROM finance_monthly
+                 WHERE tenant_id = $1 AND type = 'income') AS total_income
+            """,
+            self.tenant_id, datetime.now().date(), ACTIVE_MEMBER_STATUS
+        )
+        return {
+            'total_members': row['total_members'],
+            'active_members': row['active_members'],
+            'todays_attendance': row['todays_attendance'],
+            'total_income': float(row['total_income'])
+        }
+
+    @async_cached_query('members', 'finance', 'attendance')
+    async def get_data(self) -> tuple:
+        """Get members, finance and attendance data, querying all three concurrently."""
+        return tuple(await asyncio.gather(
+            self._fetch_df(
+                """
+                SELECT id, name, email, phone, join_date,
+                       membership_type, status, emergency_contact
+                FROM members
+                WHERE tenant_id = $1
+                """,
+                self.tenant_id
+            ),
+            self._fetch_df(
+                """
+                SELECT date, type, category, amount, description
+                FROM finance
+                WHERE tenant_id = $1
+                ORDER BY date DESC
+                """,
+                self.tenant_id
+            ),
+            self._fetch_df(
+                """
+                SELECT a.date, a.check_in, a.check_out, m.name as member_name, a.member_id
+                FROM attendance a
+                JOIN members m ON a.member_id = m.id
+                WHERE a.tenant_id = $1
+                """,
+                self.tenant_id
+            ),
+        ))
@@ -1,13 +1,37 @@
-import os
 import hashlib
+import os
 import secrets
+import threading
 from datetime import datetime, timedelta
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from utils.db_pool import get_pool
+from utils.metrics import instrument
+from utils.query_cache import QueryCache
+
+_session_cache = None
+_session_cache_lock = threading.Lock()
 
+def get_session_cache() -> QueryCache:
+    """Get the process-wide cache of validated sessions.
+
+    Entries live for ``SESSION_CACHE_TTL`` seconds (default 30) and at most
+    ``SESSION_CACHE_SIZE`` sessions are kept, least recently used first out.
+    """
+    global _session_cache
+    if _session_cache is None:
+        with _session_cache_lock:
+            if _session_cache is None:
+                _session_cache = QueryCache(
+                    max_entries=int(os.environ.get('SESSION_CACHE_SIZE', 10000)),
+                    ttl=float(os.environ.get('SESSION_CACHE_TTL', 30)),
+                )
+    return _session_cache
+
+@instrument
 class AuthManager:
     def __init__(self):
-        self.conn = psycopg2.connect(os.environ['DATABASE_URL'])
+        self.pool = get_pool()
 
     def _hash_password(self, password: str) -> str:
         """Hash a password using SHA-256."""
@@ -15,104 +39,127 @@ class AuthManager:
 
     def register_user(self, email: str, password: str, name: str, role: str = 'staff', tenant_id: int = None) -> dict:
         """Register a new user with role-based setup."""
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            try:
+        with self.pool.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                try:
+                    cur.execute(
+                        """
+                        INSERT INTO users (tenant_id, email, password_hash, name, role)
+                        VALUES (%s, %s, %s, %s, %s)
+                        RETURNING id, email, name, role, created_at
+                        """,
+                        (tenant_id, email, self._hash_password(password), name, role)
+                    )
+                    conn.commit()
+                    return cur.fetchone()
+                except psycopg2.errors.UniqueViolation:
+                    conn.rollback()
+                    raise ValueError("Email already registered")
+
+    def login_user(self, email: str, password: str) -> dict:
+        """Login a user and create a session."""
+        with self.pool.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
                     """
-                    INSERT INTO users (tenant_id, email, password_hash, name, role)
-                    VALUES (%s, %s, %s, %s, %s)
-                    RETURNING id, email, name, role, created_at
+                    SELECT id, tenant_id, email, password_hash, name, role
+                    FROM users
+                    WHERE email = %s AND status = 'active'
                     """,
-                    (tenant_id, email, self._hash_password(password), name, role)
+                    (email,)
                 )
-                self.conn.commit()
-                return cur.fetchone()
-            except psycopg2.errors.UniqueViolation:
-                self.conn.rollback()
-                raise ValueError("Email already registered")
+                user = cur.fetchone()
 
-    def login_user(self, email: str, password: str) -> dict:
-        """Login a user and create a session."""
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """
-                SELECT id, tenant_id, email, password_hash, name, role
-                FROM users
-                WHERE email = %s AND status = 'active'
-                """,
-                (email,)
-            )
-            user = cur.fetchone()
-
-            if not user or user['password_hash'] != self._hash_password(password):
-                raise ValueError("Invalid email or password")
-
-            # Create session
-            session_id = secrets.token_urlsafe(32)
-            expires_at = datetime.now() + timedelta(days=1)
-
-            cur.execute(
-                """
-                INSERT INTO sessions (user_id, session_id, expires_at)
-                VALUES (%s, %s, %s)
-                RETURNING session_id
-                """,
-                (user['id'], session_id, expires_at)
-            )
-            self.conn.commit()
-
-            return {
-                'user_id': user['id'],
-                'tenant_id': user['tenant_id'],
-                'email': user['email'],
-                'name': user['name'],
-                'role': user['role'],
-                'session_id': session_id
-            }
+                if not user or user['password_hash'] != self._hash_password(password):
+                    raise ValueError("Invalid email or password")
+
+                # Create session
+                session_id = secrets.token_urlsafe(32)
+                expires_at = datetime.now() + timedelta(days=1)
+
+                cur.execute(
+                    """
+                    INSERT INTO sessions (user_id, session_id, expires_at)
+                    VALUES (%s, %s, %s)
+                    RETURNING session_id
+                    """,
+                    (user['id'], session_id, expires_at)
+                )
+                conn.commit()
+
+                return {
+                    'user_id': user['id'],
+                    'tenant_id': user['tenant_id'],
+                    'email': user['email'],
+                    'name': user['name'],
+                    'role': user['role'],
+                    'session_id': session_id
+                }
 
     def validate_session(self, session_id: str) -> dict:
-        """Validate a session and return user info."""
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """
-                SELECT u.id as user_id, u.tenant_id, u.email, u.name, u.role
-                FROM sessions s
-                JOIN users u ON s.user_id = u.id
-                WHERE s.session_id = %s
-                AND s.expires_at > CURRENT_TIMESTAMP
-                AND s.is_active = true
-                AND u.status = 'active'
-                """,
-                (session_id,)
-            )
-            user = cur.fetchone()
-            if not user:
-                raise ValueError("Invalid or expired session")
-            return user
+        """Validate a session and return user info.
+
+        Valid sessions are cached in-process for a short TTL (never past the
+        session's own expiry), so repeated per-page checks rarely reach the
+        database. ``logout_user`` drops the entry immediately.
+        """
+        cache = get_session_cache()
+        user = cache.get(session_id)
+        if user is not None:
+            return dict(user)
+        generation = cache.generation([session_id])
+
+        with self.pool.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT u.id as user_id, u.tenant_id, u.email, u.name, u.role,
+                           s.expires_at
+                    FROM sessions s
+                    JOIN users u ON s.user_id = u.id
+                    WHERE s.session_id = %s
+                    AND s.expires_at > CURRENT_TIMESTAMP
+                    AND s.is_active = true
+                    AND u.status = 'active'
+                    """,
+                    (session_id,)
+                )
+                user = cur.fetchone()
+                if not user:
+                    raise ValueError("Invalid or expired session")
+
+        user = dict(user)
+        expires_in = (user.pop('expires_at') - datetime.now()).total_seconds()
+        cache.set(session_id, user, tags=[session_id],
+                  ttl=min(cache.ttl, expires_in), generation=generation)
+        return dict(user)
 
     def logout_user(self, session_id: str) -> bool:
         """Logout a user by deactivating their session."""
-        with self.conn.cursor() as cur:
-            cur.execute(
-                """
-                UPDATE sessions
-                SET is_active = false
-                WHERE session_id = %s
-                """,
-                (session_id,)
-            )
-            self.conn.commit()
-            return True
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE sessions
+                    SET is_active = false
+                    WHERE session_id = %s
+                    """,
+                    (session_id,)
+                )
+                conn.commit()
+        get_session_cache().invalidate_tags([session_id])
+        return True
 
     def get_user_by_id(self, user_id: int) -> dict:
         """Get user details by ID."""
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """
-                SELECT id, tenant_id, email, name, role, created_at, status
-                FROM users
-                WHERE id = %s
-                """,
-                (user_id,)
-            )
-            return cur.fetchone()
\ No newline at end of file
+        with self.pool.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT id, tenant_id, email, name, role, created_at, status
+                    FROM users
+                    WHERE id = %s
+                    """,
+                    (user_id,)
+                )
+                return cur.fetchone()
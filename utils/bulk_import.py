@@ -0,0 +1,313 @@
+import argparse
+import io
+import json
+import time
+import pandas as pd
+import psycopg2
+from utils.db_pool import get_pool
+from utils.query_cache import invalidate_tables
+from utils.read_routing import get_read_router
+from utils.rollups import add_finance_rollups, refresh_attendance_daily
+
+# Column layout, validation rules and target table for each importable file
+IMPORT_SPECS = {
+    'members': {
+        'columns': ['name', 'email', 'phone', 'join_date',
+                    'membership_type', 'status', 'emergency_contact'],
+        'required': ['name'],
+        'dates': ['join_date'],
+    },
+    'attendance': {
+        'columns': ['member_id', 'date', 'check_in', 'check_out'],
+        'required': ['member_id', 'date', 'check_in'],
+        'dates': ['date'],
+        'times': ['check_in', 'check_out'],
+    },
+    'finance': {
+        'columns': ['date', 'type', 'category', 'amount', 'description'],
+        'required': ['date', 'type', 'amount'],
+        'dates': ['date'],
+        'numbers': ['amount'],
+        'choices': {'type': ('income', 'expense')},
+    },
+    'measurements': {
+        'columns': ['member_id', 'date', 'weight', 'height',
+                    'chest', 'waist', 'arms', 'legs', 'bmi'],
+        'required': ['member_id', 'date', 'weight', 'height'],
+        'dates': ['date'],
+        'numbers': ['weight', 'height', 'chest', 'waist', 'arms', 'legs'],
+    },
+}
+
+MAX_REJECTED_DETAILS = 1000
+
+class BulkImporter:
+    """Stream CSV exports from another system into a tenant's tables with COPY.
+
+    Each chunk of ``batch_size`` rows is validated in pandas, copied and
+    committed in its own transaction, so a bad batch only loses itself.
+    Imported members keep their source id in ``members.source_id``, and
+    attendance and measurements imports resolve ``member_id`` through it,
+    whichever run imported the members. Only with ``member_ids_are_local``
+    are those ids taken as the tenant's own member ids.
+    """
+
+    def __init__(self, tenant_id: int, batch_size: int = 10000,
+                 member_ids_are_local: bool = False):
+        if not tenant_id:
+            raise ValueError("Tenant ID is required for this operation")
+        self.tenant_id = tenant_id
+        self.batch_size = batch_size
+        self.member_ids_are_local = member_ids_are_local
+        self.pool = get_pool()
+        self.member_id_map = {}
+
+    def import_members(self, source) -> dict:
+        """Import members, recording the source id of each row if present."""
+        return self.import_csv('members', source)
+
+    def import_attendance(self, source) -> dict:
+        """Import attendance rows."""
+        return self.import_csv('attendance', source)
+
+    def import_finance(self, source) -> dict:
+        """Import financial records."""
+        return self.import_csv('finance', source)
+
+    def import_measurements(self, source) -> dict:
+        """Import measurements, computing BMI from weight and height."""
+        return self.import_csv('measurements', source)
+
+    def import_csv(self, table: str, source) -> dict:
+        """Import a CSV path or file object into ``table`` and return a report."""
+        if table not in IMPORT_SPECS:
+            raise ValueError(f"Unsupported import table: {table}")
+        spec = IMPORT_SPECS[table]
+
+        report = {
+            'table': table,
+            'rows_read': 0,
+            'rows_imported': 0,
+            'rows_rejected': 0,
+            'batches': 0,
+            'rejected': [],
+        }
+        started = time.perf_counter()
+        known_members = None
+        if 'member_id' in spec['columns']:
+            if self.member_ids_are_local:
+                known_members = self._tenant_member_ids()
+            else:
+                self.member_id_map.update(self._source_member_ids())
+
+        reader = pd.read_csv(source, dtype=str, keep_default_na=False,
+                             chunksize=self.batch_size)
+        for chunk in reader:
+            missing = [c for c in spec['required'] if c not in chunk.columns]
+            if missing:
+                raise ValueError(f"Missing required columns for {table}: {', '.join(missing)}")
+
+            # Line numbers as seen in the file, counting the header row
+            chunk.index = pd.RangeIndex(report['rows_read'] + 2,
+                                        report['rows_read'] + 2 + len(chunk))
+            report['rows_read'] += len(chunk)
+
+            batch, rejected = self._prepare(table, chunk, known_members)
+            if not batch.empty:
+                try:
+                    self._copy_batch(table, batch)
+                    report['rows_imported'] += len(batch)
+                except psycopg2.Error as e:
+                    reason = str(e).strip().splitlines()[0]
+                    rejected.extend((line, reason) for line in batch.index)
+            report['batches'] += 1
+
+            report['rows_rejected'] += len(rejected)
+            room = MAX_REJECTED_DETAILS - len(report['rejected'])
+            report['rejected'].extend(
+                {'line': int(line), 'reason': reason} for line, reason in rejected[:room]
+            )
+
+        report['seconds'] = round(time.perf_counter() - started, 3)
+        report['rows_per_second'] = (
+            round(report['rows_imported'] / report['seconds'], 1) if report['seconds'] else 0.0
+        )
+        return report
+
+    def _tenant_member_ids(self) -> set:
+        """Get the ids of the tenant's existing members."""
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT id FROM members WHERE tenant_id = %s", (self.tenant_id,))
+                return {row[0] for row in cur.fetchall()}
+
+    def _source_member_ids(self) -> dict:
+        """Get the source-id -> member id map of the tenant's imported members."""
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT source_id, id FROM members WHERE tenant_id = %s AND source_id IS NOT NULL",
+                    (self.tenant_id,)
+                )
+                return dict(cur.fetchall())
+
+    def _prepare(self, table: str, chunk: pd.DataFrame, known_members) -> tuple:
+        """Validate and convert a chunk, returning (clean rows, rejected rows)."""
+        spec = IMPORT_SPECS[table]
+        df = pd.DataFrame(index=chunk.index)
+        for column in spec['columns']:
+            values = chunk[column].str.strip() if column in chunk.columns else pd.Series('', index=chunk.index)
+            df[column] = values.mask(values == '')
+        if table == 'members':
+            source_ids = chunk['id'] if 'id' in chunk.columns else pd.Series(None, index=chunk.index)
+            df['source_id'] = pd.to_numeric(source_ids, errors='coerce').astype('Int64')
+
+        reasons = pd.Series(None, index=df.index, dtype=object)
+
+        def reject(mask, reason):
+            reasons[mask & reasons.isna()] = reason
+
+        for column in spec['required']:
+            reject(df[column].isna(), f"missing {column}")
+
+        for column in spec.get('dates', []):
+            parsed = pd.to_datetime(df[column], format='%Y-%m-%d', errors='coerce')
+            reject(df[column].notna() & parsed.isna(), f"invalid {column}")
+            df[column] = parsed.dt.strftime('%Y-%m-%d')
+
+        for column in spec.get('times', []):
+            parsed = pd.to_datetime(df[column], format='%H:%M:%S', errors='coerce')
+            parsed = parsed.fillna(pd.to_datetime(df[column], format='%H:%M', errors='coerce'))
+            reject(df[column].notna() & parsed.isna(), f"invalid {column}")
+            df[column] = parsed.dt.strftime('%H:%M:%S')
+
+        for column in spec.get('numbers', []):
+            parsed = pd.to_numeric(df[column], errors='coerce')
+            reject(df[column].notna() & parsed.isna(), f"invalid {column}")
+            df[column] = parsed
+
+        for column, allowed in spec.get('choices', {}).items():
+            df[column] = df[column].str.lower()
+            reject(df[column].notna() & ~df[column].isin(allowed), f"invalid {column}")
+
+        if 'member_id' in df.columns:
+            source_ids = pd.to_numeric(df['member_id'], errors='coerce')
+            if self.member_ids_are_local:
+                member_ids = source_ids.where(source_ids.isin(known_members or ()))
+            else:
+                member_ids = source_ids.map(self.member_id_map)
+            reject(df['member_id'].notna() & member_ids.isna(), "unknown member_id")
+            df['member_id'] = member_ids.astype('Int64')
+
+        if table == 'measurements':
+            reject(df['height'] <= 0, "invalid height")
+            height_m = df['height'] / 100
+            df['bmi'] = (df['weight'] / (height_m * height_m)).round(2)
+
+        clean = df[reasons.isna()]
+        rejected = list(reasons.dropna().items())
+        return clean, rejected
+
+    def _copy_batch(self, table: str, batch: pd.DataFrame):
+        """COPY one validated batch into ``table`` inside its own transaction."""
+        columns = IMPORT_SPECS[table]['columns']
+        new_ids = {}
+        with self.pool.connection() as conn:
+            try:
+                with conn.cursor() as cur:
+                    if table == 'members':
+                        new_ids = self._copy_members(cur, batch)
+                    else:
+                        buf = io.StringIO()
+                        batch[columns].assign(tenant_id=self.tenant_id).to_csv(
+                            buf, columns=['tenant_id'] + columns, index=False, header=False
+                        )
+                        buf.seek(0)
+                        cur.copy_expert(
+                            f"COPY {table} (tenant_id, {', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                            buf
+                        )
+                        if table == 'attendance':
+                            refresh_attendance_daily(cur, self.tenant_id, batch['date'].unique().tolist())
+                        elif table == 'finance':
+                            totals = (batch.fillna({'category': ''})
+                                      .groupby(['date', 'type', 'category'])['amount']
+                                      .agg(total='sum', entries='count')
+                                      .reset_index())
+                            add_finance_rollups(cur, self.tenant_id, [
+                                (row.date, row.type, row.category, float(row.total), int(row.entries))
+                                for row in totals.itertuples(index=False)
+                            ])
+                conn.commit()
+            except psycopg2.Error:
+                conn.rollback()
+                raise
+        # Only ids of committed members may be resolved by later imports
+        self.member_id_map.update(new_ids)
+        get_read_router().note_write(self.tenant_id)
+        invalidate_tables(self.tenant_id, table)
+
+    def _copy_members(self, cur, batch: pd.DataFrame) -> dict:
+        """COPY members through a staging table and return their source-id -> new-id map."""
+        columns = IMPORT_SPECS['members']['columns']
+        cur.execute(
+            """
+            CREATE TEMP TABLE import_members_stage (
+                source_id bigint, name text, email text, phone text, join_date date,
+                membership_type text, status text, emergency_contact text, new_id bigint
+            ) ON COMMIT DROP
+            """
+        )
+        buf = io.StringIO()
+        batch.to_csv(buf, columns=['source_id'] + columns, index=False, header=False)
+        buf.seek(0)
+        cur.copy_expert(
+            f"COPY import_members_stage (source_id, {', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buf
+        )
+        cur.execute(
+            """
+            UPDATE import_members_stage
+            SET new_id = nextval(pg_get_serial_sequence('members', 'id'))
+            """
+        )
+        cur.execute(
+            """
+            INSERT INTO members (
+                id, tenant_id, source_id, name, email, phone, join_date,
+                membership_type, status, emergency_contact
+            )
+            SELECT new_id, %s, source_id, name, email, phone, COALESCE(join_date, CURRENT_DATE),
+                   membership_type, status, emergency_contact
+            FROM import_members_stage
+            """,
+            (self.tenant_id,)
+        )
+        cur.execute(
+            "SELECT source_id, new_id FROM import_members_stage WHERE source_id IS NOT NULL"
+        )
+        return dict(cur.fetchall())
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import gym data from CSV files.")
+    parser.add_argument('--tenant-id', type=int, required=True)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--member-ids-are-local', action='store_true',
+                        help="take member_id in attendance/measurements files as this tenant's "
+                             "member ids instead of source ids of imported members")
+    for table in IMPORT_SPECS:
+        parser.add_argument(f'--{table}', metavar='CSV', help=f"{table} file to import")
+    args = parser.parse_args()
+
+    importer = BulkImporter(args.tenant_id, batch_size=args.batch_size,
+                            member_ids_are_local=args.member_ids_are_local)
+    reports = []
+    # Members go first so the other files can resolve their member ids
+    for table in IMPORT_SPECS:
+        path = getattr(args, table)
+        if path:
+            reports.append(importer.import_csv(table, path))
+    print(json.dumps(reports, indent=2))
+
+if __name__ == '__main__':
+    main()
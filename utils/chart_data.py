@@ -0,0 +1,66 @@
+import os
+import numpy as np
+import pandas as pd
+
+# SQL date_trunc units, finest first
+BUCKETS = ('day', 'week', 'month')
+
+# Upper bound on points per series sent to the browser
+MAX_CHART_POINTS = int(os.environ.get('CHART_MAX_POINTS', 500))
+
+def choose_bucket(start_date, end_date, max_points: int = MAX_CHART_POINTS) -> str:
+    """Pick the finest bucket that keeps a date range within ``max_points`` points."""
+    days = (pd.Timestamp(end_date) - pd.Timestamp(start_date)).days + 1
+    if days <= max_points:
+        return 'day'
+    if days / 7 <= max_points:
+        return 'week'
+    return 'month'
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept; in between, each bucket keeps
+    the point forming the largest triangle with the previously kept point
+    and the average of the next bucket, which preserves peaks and troughs.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = y[avg_start:avg_end].mean()
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(areas.argmax())
+        kept[i + 1] = a
+    return kept
+
+def downsample(df: pd.DataFrame, x: str, y: str, max_points: int = MAX_CHART_POINTS,
+               group: str = None) -> pd.DataFrame:
+    """Reduce each series of a sorted frame to at most ``max_points`` points with LTTB."""
+    if group is not None:
+        parts = [
+            downsample(part, x, y, max_points)
+            for _, part in df.groupby(group, observed=True, sort=False)
+        ]
+        return pd.concat(parts, ignore_index=True) if parts else df
+
+    if len(df) <= max_points:
+        return df
+    xs = df[x].to_numpy()
+    if np.issubdtype(xs.dtype, np.datetime64):
+        xs = xs.astype('datetime64[s]').astype(np.int64) / 86400.0
+    kept = lttb_indices(xs.astype(np.float64), df[y].to_numpy(dtype=np.float64), max_points)
+    return df.iloc[kept].reset_index(drop=True)
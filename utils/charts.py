@@ -1,38 +1,109 @@
+import json
+import os
+import threading
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+from utils.query_cache import QueryCache
 
-def create_attendance_chart(attendance_df, members_df):
-    # Merge attendance with member names
-    df = pd.merge(attendance_df, members_df[['id', 'name']], 
-                 left_on='member_id', right_on='id')
-    
-    # Group by date and count
-    daily_attendance = df.groupby('date').size().reset_index(name='count')
-    
-    fig = px.line(daily_attendance, x='date', y='count',
-                  title='Daily Attendance',
-                  labels={'count': 'Number of Members', 'date': 'Date'})
+BUCKET_LABELS = {'day': 'Daily', 'week': 'Weekly', 'month': 'Monthly'}
+
+def create_attendance_chart(series_df):
+    # Visits come bucketed and downsampled from DataManager.get_attendance_series
+    bucket = BUCKET_LABELS[series_df.attrs.get('bucket', 'day')]
+    fig = px.line(series_df, x='date', y='visits',
+                  title=f'{bucket} Attendance',
+                  labels={'visits': 'Number of Members', 'date': 'Date'})
     
     return fig
 
-def create_financial_chart(finance_df):
-    # Group by date and type
-    daily_summary = finance_df.groupby(['date', 'type'])['amount'].sum().reset_index()
-    
-    fig = px.line(daily_summary, x='date', y='amount', color='type',
-                  title='Financial Summary',
+def create_financial_chart(series_df):
+    # Totals come bucketed and downsampled from DataManager.get_finance_series
+    bucket = BUCKET_LABELS[series_df.attrs.get('bucket', 'day')]
+    fig = px.line(series_df, x='date', y='amount', color='type',
+                  title=f'{bucket} Financial Summary',
                   labels={'amount': 'Amount ($)', 'date': 'Date'})
     
     return fig
 
-def create_measurement_progress_chart(measurements_df, metric):
-    fig = px.line(measurements_df, x='date', y=metric,
-                  title=f'{metric.capitalize()} Progress Over Time',
-                  labels={metric: metric.capitalize(), 'date': 'Date'})
+def create_portfolio_chart(summary_df):
+    # One group of bars per gym from TenantManager.get_owner_summary
+    fig = px.bar(summary_df, x='name', y=['income', 'expenses', 'net'], barmode='group',
+                 title='Revenue by Gym',
+                 labels={'name': 'Gym', 'value': 'Amount ($)', 'variable': ''})
+
+    return fig
+
+# Measurement columns shown on the combined progress chart; weight gets its own axis
+PROGRESS_METRICS = {
+    'weight': 'Weight (kg)',
+    'chest': 'Chest (cm)',
+    'waist': 'Waist (cm)',
+    'arms': 'Arms (cm)',
+    'legs': 'Legs (cm)',
+}
+
+def create_progress_chart(measurements_df):
+    # One trace per metric; clicking a legend entry hides or shows it
+    fig = go.Figure()
+    for metric, label in PROGRESS_METRICS.items():
+        fig.add_trace(go.Scatter(
+            x=measurements_df['date'], y=measurements_df[metric],
+            name=label, mode='lines+markers',
+            yaxis='y2' if metric == 'weight' else 'y'
+        ))
+
+    fig.update_layout(
+        title='Progress Over Time',
+        xaxis={'title': 'Date'},
+        yaxis={'title': 'Measurement (cm)'},
+        yaxis2={'title': 'Weight (kg)', 'overlaying': 'y', 'side': 'right'},
+        legend={'orientation': 'h', 'y': -0.2,
+                'itemclick': 'toggle', 'itemdoubleclick': 'toggleothers'},
+        hovermode='x unified'
+    )
     
     return fig
 
+def create_member_progress_figures(measurements_df):
+    # The figures of a member's Progress Tracking view
+    return {
+        'bmi': create_bmi_gauge(measurements_df.iloc[-1]['bmi']),
+        'progress': create_progress_chart(measurements_df),
+    }
+
+_figure_cache = None
+_figure_cache_lock = threading.Lock()
+
+def get_figure_cache() -> QueryCache:
+    """Get the process-wide cache of serialized figures.
+
+    Sized by ``FIGURE_CACHE_SIZE`` (default 256 entries) with entries living
+    ``FIGURE_CACHE_TTL`` seconds (default 3600); keys carry the version of
+    the data drawn, so entries never need invalidating.
+    """
+    global _figure_cache
+    if _figure_cache is None:
+        with _figure_cache_lock:
+            if _figure_cache is None:
+                _figure_cache = QueryCache(
+                    max_entries=int(os.environ.get('FIGURE_CACHE_SIZE', 256)),
+                    ttl=float(os.environ.get('FIGURE_CACHE_TTL', 3600)),
+                )
+    return _figure_cache
+
+def cached_figures(key, build):
+    """Get a dict of figures cached as JSON under ``key``, calling ``build()`` on a miss."""
+    cache = get_figure_cache()
+    payload = cache.get(key)
+    if payload is None:
+        figures = build()
+        cache.set(key, {name: fig.to_json() for name, fig in figures.items()})
+        return figures
+    # The JSON came from valid figures and st.plotly_chart validates again,
+    # so skip plotly's (slow) validation when rebuilding them
+    return {name: go.Figure(json.loads(data), _validate=False) for name, data in payload.items()}
+
 def create_bmi_gauge(bmi_value):
     fig = go.Figure(go.Indicator(
         mode = "gauge+number",
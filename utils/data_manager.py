@@ -1,42 +1,244 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-import os
-import psycopg2
 from psycopg2.extras import RealDictCursor
-from datetime import datetime
-import pandas as pd
+from datetime import datetime, date, timedelta
+from utils.db_pool import get_pool
+from utils.query_cache import cached_query, invalidate_tables
+from utils.result_loader import read_frame
+from utils.metrics import instrument
+from utils.read_routing import get_read_router
+from utils.chart_data import MAX_CHART_POINTS, choose_bucket, downsample
+from utils.incremental import DeltaFrame, get_delta_store
+from utils.rollups import add_finance_rollups
+
+# Member status counted as active by the dashboard and the owner portfolio
+ACTIVE_MEMBER_STATUS = 'Active'
+
+# Inserts a batch of check-ins and folds them into the daily rollup; a
+# member counts as unique if they had no earlier visit that day
+CHECK_IN_SQL = """
+    WITH new_visits AS (
+        INSERT INTO attendance (tenant_id, member_id, date, check_in)
+        SELECT %(tenant_id)s::int, v.member_id, v.date, v.check_in
+        FROM unnest(%(member_ids)s::int[], %(dates)s::date[], %(times)s::time[])
+            AS v (member_id, date, check_in)
+        RETURNING member_id, date
+    ), first_visits AS (
+        SELECT DISTINCT n.member_id, n.date
+        FROM new_visits n
+        WHERE NOT EXISTS (
+            SELECT 1 FROM attendance a
+            WHERE a.tenant_id = %(tenant_id)s
+            AND a.member_id = n.member_id
+            AND a.date = n.date
+        )
+    )
+    INSERT INTO attendance_daily (tenant_id, date, visits, unique_members)
+    SELECT %(tenant_id)s::int, n.date, COUNT(*),
+           (SELECT COUNT(*) FROM first_visits f WHERE f.date = n.date)
+    FROM new_visits n
+    GROUP BY n.date
+    ON CONFLICT (tenant_id, date) DO UPDATE
+    SET visits = attendance_daily.visits + EXCLUDED.visits,
+        unique_members = attendance_daily.unique_members + EXCLUDED.unique_members
+"""
+
+# Closes the open visit of each (member, date) and adds the finished
+# sessions to the daily rollup
+CHECK_OUT_SQL = """
+    WITH closed AS (
+        UPDATE attendance a
+        SET check_out = v.check_out
+        FROM unnest(%(member_ids)s::int[], %(dates)s::date[], %(times)s::time[])
+            AS v (member_id, date, check_out)
+        WHERE a.tenant_id = %(tenant_id)s
+        AND a.member_id = v.member_id
+        AND a.date = v.date
+        AND a.check_out IS NULL
+        RETURNING a.date, a.check_in, a.check_out
+    )
+    INSERT INTO attendance_daily (tenant_id, date, completed_visits, total_session_seconds)
+    SELECT %(tenant_id)s::int, date, COUNT(*),
+           SUM(GREATEST(EXTRACT(EPOCH FROM check_out - check_in), 0))::bigint
+    FROM closed
+    GROUP BY date
+    ON CONFLICT (tenant_id, date) DO UPDATE
+    SET completed_visits = attendance_daily.completed_visits + EXCLUDED.completed_visits,
+        total_session_seconds = attendance_daily.total_session_seconds
+            + EXCLUDED.total_session_seconds
+"""
+
+# Totals by type and category: whole months come from finance_monthly and
+# the days outside them from finance_daily (see month_span)
+FINANCE_TOTALS_SQL = """
+    SELECT type, NULLIF(category, '') AS category,
+           SUM(total) AS amount, SUM(entries) AS entries
+    FROM (
+        SELECT type, category, total, entries
+        FROM finance_monthly
+        WHERE tenant_id = %(tenant_id)s
+        AND month >= %(months_start)s AND month < %(months_end)s
+        UNION ALL
+        SELECT type, category, total, entries
+        FROM finance_daily
+        WHERE tenant_id = %(tenant_id)s
+        AND date BETWEEN %(start)s AND %(end)s
+        AND NOT (date >= %(months_start)s AND date < %(months_end)s)
+    ) totals
+    GROUP BY type, category
+    ORDER BY type, category
+"""
+
+def group_attendance_events(events: list) -> list:
+    """Turn attendance events into ordered (check_in, rows) groups.
+
+    Events are sorted by timestamp (default now) and consecutive events of
+    the same kind are grouped, so each group maps to one statement and a
+    check-out later in the batch closes a check-in earlier in it. Rows are
+    (member_id, date, time); only the first check-out of a member per day
+    is kept, since it closes their open visit.
+    """
+    now = datetime.now()
+    ordered = sorted(
+        ((event['member_id'], event.get('check_in', True), event.get('timestamp') or now)
+         for event in events),
+        key=lambda event: event[2]
+    )
+
+    groups = []
+    for member_id, check_in, timestamp in ordered:
+        if not groups or groups[-1][0] != check_in:
+            groups.append((check_in, []))
+        groups[-1][1].append((member_id, timestamp.date(), timestamp.time()))
+
+    for i, (check_in, rows) in enumerate(groups):
+        if not check_in:
+            first = {}
+            for member_id, day, time in rows:
+                first.setdefault((member_id, day), time)
+            groups[i] = (check_in, [(member_id, day, time) for (member_id, day), time in first.items()])
+    return groups
+
+def month_span(start_date=None, end_date=None) -> tuple:
+    """Split a date range for the finance rollups.
+
+    Returns (start, end, months_start, months_end), where
+    [months_start, months_end) is the span of whole calendar months inside
+    [start, end]. Without a range, all dates are covered.
+    """
+    if start_date and end_date:
+        start, end = pd.Timestamp(start_date).date(), pd.Timestamp(end_date).date()
+    else:
+        start, end = date.min, date.max - timedelta(days=1)
 
+    months_start = start if start.day == 1 else (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+    months_end = (end + timedelta(days=1)).replace(day=1)
+    if months_start > months_end:
+        months_start = months_end
+    return start, end, months_start, months_end
+
+# get_data's queries for incremental refresh, with ids to merge rows by;
+# {changed} is replaced by TRUE for a full load or by the filter for rows
+# changed since %(since)s. Attendance rows also change
+# when the member's name does; the union keeps both branches on indexes.
+DELTA_QUERIES = {
+    'members': ("""
+        SELECT id, name, email, phone, join_date,
+               membership_type, status, emergency_contact
+        FROM members
+        WHERE tenant_id = %(tenant_id)s AND {changed}
+    """, "updated_at > %(since)s"),
+    'finance': ("""
+        SELECT id, date, type, category, amount, description
+        FROM finance
+        WHERE tenant_id = %(tenant_id)s AND {changed}
+    """, "updated_at > %(since)s"),
+    'attendance': ("""
+        SELECT a.id, a.date, a.check_in, a.check_out, m.name as member_name, a.member_id
+        FROM attendance a
+        JOIN members m ON a.member_id = m.id
+        WHERE a.tenant_id = %(tenant_id)s AND {changed}
+    """, """a.id IN (
+            SELECT id FROM attendance
+            WHERE tenant_id = %(tenant_id)s AND updated_at > %(since)s
+            UNION
+            SELECT ca.id FROM attendance ca
+            JOIN members cm ON ca.member_id = cm.id
+            WHERE ca.tenant_id = %(tenant_id)s AND cm.tenant_id = %(tenant_id)s
+            AND cm.updated_at > %(since)s
+        )"""),
+}
+
+# Columns get_data returns for each frame, in order
+DATA_COLUMNS = {
+    'members': ['id', 'name', 'email', 'phone', 'join_date',
+                'membership_type', 'status', 'emergency_contact'],
+    'finance': ['date', 'type', 'category', 'amount', 'description'],
+    'attendance': ['date', 'check_in', 'check_out', 'member_name', 'member_id'],
+}
+
+class QueryFanoutError(Exception):
+    """One or more queries of a fan-out failed.
+
+    ``errors`` maps each failed query name to its exception; ``results`` and
+    ``timings`` hold what the other queries returned and how long each took.
+    """
+
+    def __init__(self, errors: dict, results: dict, timings: dict):
+        self.errors = errors
+        self.results = results
+        self.timings = timings
+        super().__init__("; ".join(f"{name}: {error}" for name, error in errors.items()))
+
+@instrument
 class DataManager:
     def __init__(self, tenant_id: int = None):
         self.tenant_id = tenant_id
-        self.conn = psycopg2.connect(os.environ['DATABASE_URL'])
+        self.pool = get_pool()
+        self.router = get_read_router()
+        self.last_timings = {}
+        self.last_delta_rows = {}
 
     def _check_tenant(self):
         """Ensure tenant_id is set before operations."""
         if not self.tenant_id:
             raise ValueError("Tenant ID is required for this operation")
 
+    def _read_pool(self):
+        """Pool for a read-only query: the replica when it is safe, else the primary."""
+        return self.router.pool_for_read(self.tenant_id)
+
+    def _written(self, *tables):
+        """After a commit: pin this tenant's reads to the primary, then drop cached reads."""
+        self.router.note_write(self.tenant_id)
+        invalidate_tables(self.tenant_id, *tables)
+
     def add_member(self, member_data: dict) -> int:
         """Add a new member for the current tenant."""
         self._check_tenant()
-        with self.conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO members (
-                    tenant_id, name, email, phone,
-                    membership_type, status, emergency_contact
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s
-                ) RETURNING id
-                """,
-                (
-                    self.tenant_id, member_data['name'], member_data['email'],
-                    member_data['phone'], member_data['membership_type'],
-                    member_data['status'], member_data['emergency_contact']
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO members (
+                        tenant_id, name, email, phone,
+                        membership_type, status, emergency_contact
+                    ) VALUES (
+                        %s, %s, %s, %s, %s, %s, %s
+                    ) RETURNING id
+                    """,
+                    (
+                        self.tenant_id, member_data['name'], member_data['email'],
+                        member_data['phone'], member_data['membership_type'],
+                        member_data['status'], member_data['emergency_contact']
+                    )
                 )
-            )
-            self.conn.commit()
-            return cur.fetchone()[0]
+                conn.commit()
+                self._written('members')
+                return cur.fetchone()[0]
 
+    @cached_query('members')
     def get_members(self) -> pd.DataFrame:
         """Get all members for the current tenant."""
         self._check_tenant()
@@ -46,55 +248,260 @@ class DataManager:
             FROM members
             WHERE tenant_id = %s
         """
-        return pd.read_sql_query(query, self.conn, params=(self.tenant_id,))
+        with self._read_pool().connection() as conn:
+            return read_frame(conn, query, (self.tenant_id,), name='get_members')
 
-    def update_member(self, member_id: int, updated_data: dict):
-        """Update member details."""
+    @cached_query('members')
+    def get_member(self, member_id: int) -> dict:
+        """Get a single member of the current tenant, or None if not found."""
         self._check_tenant()
-        fields = ', '.join([f"{k} = %s" for k in updated_data.keys()])
-        values = list(updated_data.values())
-        values.extend([self.tenant_id, member_id])
+        with self._read_pool().connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT id, name, email, phone, join_date,
+                           membership_type, status, emergency_contact
+                    FROM members
+                    WHERE tenant_id = %s AND id = %s
+                    """,
+                    (self.tenant_id, member_id)
+                )
+                return cur.fetchone()
 
-        with self.conn.cursor() as cur:
-            cur.execute(
-                f"""
-                UPDATE members
-                SET {fields}
-                WHERE tenant_id = %s AND id = %s
-                """,
-                values
-            )
-            self.conn.commit()
+    @cached_query('members')
+    def get_member_directory(self) -> dict:
+        """Get an id -> name map of the tenant's members, ordered by name.
 
-    def record_attendance(self, member_id: int, check_in: bool = True):
-        """Record member attendance."""
+        Lets member pickers look names up in O(1) without loading the full
+        roster DataFrame.
+        """
         self._check_tenant()
-        today = datetime.now().date()
-        current_time = datetime.now().time()
+        with self._read_pool().connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT id, name
+                    FROM members
+                    WHERE tenant_id = %s
+                    ORDER BY name, id
+                    """,
+                    (self.tenant_id,)
+                )
+                return dict(cur.fetchall())
 
-        with self.conn.cursor() as cur:
-            if check_in:
+    @cached_query('members')
+    def get_member_statuses(self) -> list:
+        """Get the distinct member statuses in use, including None for members without one."""
+        self._check_tenant()
+        with self._read_pool().connection() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
                     """
-                    INSERT INTO attendance (tenant_id, member_id, date, check_in)
-                    VALUES (%s, %s, %s, %s)
+                    SELECT DISTINCT status
+                    FROM members
+                    WHERE tenant_id = %s
+                    ORDER BY status NULLS LAST
                     """,
-                    (self.tenant_id, member_id, today, current_time)
+                    (self.tenant_id,)
                 )
-            else:
+                return [row[0] for row in cur.fetchall()]
+
+    @cached_query('members')
+    def lookup_members(self, prefix: str, limit: int = 20) -> tuple:
+        """Get up to ``limit`` (id, name) pairs whose name starts with ``prefix``, for type-ahead."""
+        self._check_tenant()
+        prefix = (prefix or '').strip()
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        with self._read_pool().connection() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
                     """
-                    UPDATE attendance
-                    SET check_out = %s
-                    WHERE tenant_id = %s 
-                    AND member_id = %s 
-                    AND date = %s 
-                    AND check_out IS NULL
+                    SELECT id, name
+                    FROM members
+                    WHERE tenant_id = %s AND lower(name) LIKE lower(%s)
+                    ORDER BY lower(name), id
+                    LIMIT %s
+                    """,
+                    (self.tenant_id, f"{escaped}%", limit)
+                )
+                return tuple(cur.fetchall())
+
+    @cached_query('members')
+    def search_members(self, query: str = '', statuses: list = None,
+                       after_id: int = 0, limit: int = 50) -> pd.DataFrame:
+        """Search members by name, one keyset page at a time.
+
+        Results are ordered by id; pass the last id of a page as ``after_id``
+        to fetch the next one. Queries shorter than three characters match
+        on a name prefix, longer ones on a substring so a trigram index on
+        ``name`` can serve them. ``statuses=None`` disables the status filter;
+        a None among ``statuses`` matches members without a status.
+        """
+        self._check_tenant()
+        sql = """
+            SELECT id, name, email, phone, join_date,
+                   membership_type, status, emergency_contact
+            FROM members
+            WHERE tenant_id = %s AND id > %s
+        """
+        params = [self.tenant_id, after_id or 0]
+
+        query = (query or '').strip()
+        if query:
+            escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            if len(query) < 3:
+                sql += " AND lower(name) LIKE lower(%s)"
+                params.append(f"{escaped}%")
+            else:
+                sql += " AND name ILIKE %s"
+                params.append(f"%{escaped}%")
+
+        if statuses is not None:
+            statuses = list(statuses)
+            if None in statuses:
+                sql += " AND (status = ANY(%s) OR status IS NULL)"
+            else:
+                sql += " AND status = ANY(%s)"
+            params.append([status for status in statuses if status is not None])
+
+        sql += " ORDER BY id LIMIT %s"
+        params.append(limit)
+
+        with self._read_pool().connection() as conn:
+            return read_frame(conn, sql, params, name='search_members')
+
+    def update_member(self, member_id: int, updated_data: dict):
+        """Update member details."""
+        self._check_tenant()
+        fields = ', '.join([f"{k} = %s" for k in updated_data.keys()])
+        values = list(updated_data.values())
+        values.extend([self.tenant_id, member_id])
+
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    UPDATE members
+                    SET {fields}
+                    WHERE tenant_id = %s AND id = %s
                     """,
-                    (current_time, self.tenant_id, member_id, today)
+                    values
                 )
-            self.conn.commit()
+                conn.commit()
+                self._written('members')
+
+    def record_attendance(self, member_id: int, check_in: bool = True):
+        """Record member attendance."""
+        self.record_attendance_batch([
+            {'member_id': member_id, 'check_in': check_in, 'timestamp': datetime.now()}
+        ])
+
+    def record_attendance_batch(self, events: list):
+        """Record many check-ins and check-outs in one round-trip and one commit.
+
+        Each event is a dict with ``member_id``, ``check_in`` (True for a
+        check-in, False for a check-out) and an optional ``timestamp``
+        (defaults to now). Events are applied in timestamp order, so a
+        check-out later in the batch closes a check-in earlier in it.
+        """
+        self._check_tenant()
+        if not events:
+            return
+
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                statements = [
+                    cur.mogrify(CHECK_IN_SQL if check_in else CHECK_OUT_SQL, self._attendance_params(rows))
+                    for check_in, rows in group_attendance_events(events)
+                ]
+                # Sent as a single multi-statement query: one round-trip, one commit
+                cur.execute(b';'.join(statements))
+                conn.commit()
+                self._written('attendance')
+
+    def _attendance_params(self, rows: list) -> dict:
+        """Turn (member_id, date, time) rows into array parameters for unnest()."""
+        member_ids, dates, times = (list(column) for column in zip(*rows))
+        return {'tenant_id': self.tenant_id, 'member_ids': member_ids, 'dates': dates, 'times': times}
+
+    @cached_query('attendance')
+    def get_attendance_daily(self, start_date=None, end_date=None) -> pd.DataFrame:
+        """Get per-day visits, unique members and average session length from the rollup."""
+        self._check_tenant()
+        query = """
+            SELECT date, visits, unique_members,
+                   CASE WHEN completed_visits > 0
+                        THEN total_session_seconds / completed_visits / 60.0
+                   END AS avg_session_minutes
+            FROM attendance_daily
+            WHERE tenant_id = %s
+        """
+        params = [self.tenant_id]
 
+        if start_date and end_date:
+            query += " AND date BETWEEN %s AND %s"
+            params.extend([start_date, end_date])
+        query += " ORDER BY date"
+
+        with self._read_pool().connection() as conn:
+            return read_frame(conn, query, params, name='get_attendance_daily')
+
+    @cached_query('attendance')
+    def get_attendance_series(self, start_date=None, end_date=None,
+                              max_points: int = MAX_CHART_POINTS) -> pd.DataFrame:
+        """Get visits per day, week or month for charting, at most ``max_points`` rows.
+
+        The bucket is the finest that fits the range and is summed in SQL
+        from the rollup; longer series are then downsampled with LTTB. The
+        bucket used is in ``df.attrs['bucket']``.
+        """
+        self._check_tenant()
+        start, end = self._rollup_range('attendance_daily', start_date, end_date)
+        bucket = choose_bucket(start, end, max_points)
+        query = """
+            SELECT date_trunc(%(bucket)s, date)::date AS date, SUM(visits) AS visits
+            FROM attendance_daily
+            WHERE tenant_id = %(tenant_id)s AND date BETWEEN %(start)s AND %(end)s
+            GROUP BY 1
+            ORDER BY 1
+        """
+        params = {'tenant_id': self.tenant_id, 'bucket': bucket, 'start': start, 'end': end}
+
+        with self._read_pool().connection() as conn:
+            df = read_frame(conn, query, params, name='get_attendance_series')
+        df = downsample(df, 'date', 'visits', max_points)
+        df.attrs['bucket'] = bucket
+        return df
+
+    @cached_query('attendance')
+    def get_attendance_stats(self, start_date, end_date) -> dict:
+        """Get visit totals for a date range from the rollup, plus distinct visitors."""
+        self._check_tenant()
+        query = """
+            SELECT
+                (SELECT COALESCE(SUM(visits), 0) FROM attendance_daily
+                 WHERE tenant_id = %(tenant_id)s AND date BETWEEN %(start)s AND %(end)s) AS total_visits,
+                (SELECT COALESCE(SUM(total_session_seconds), 0) / NULLIF(SUM(completed_visits), 0) / 60.0
+                 FROM attendance_daily
+                 WHERE tenant_id = %(tenant_id)s AND date BETWEEN %(start)s AND %(end)s) AS avg_session_minutes,
+                (SELECT COUNT(DISTINCT member_id) FROM attendance
+                 WHERE tenant_id = %(tenant_id)s AND date BETWEEN %(start)s AND %(end)s) AS unique_members
+        """
+        params = {'tenant_id': self.tenant_id, 'start': start_date, 'end': end_date}
+
+        with self._read_pool().connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, params)
+                row = cur.fetchone()
+        return {
+            'total_visits': int(row['total_visits']),
+            'unique_members': row['unique_members'],
+            'avg_session_minutes': (
+                float(row['avg_session_minutes']) if row['avg_session_minutes'] is not None else None
+            )
+        }
+
+    @cached_query('attendance', 'members')
     def get_attendance_report(self, start_date=None, end_date=None) -> pd.DataFrame:
         """Get attendance report for the current tenant."""
         self._check_tenant()
@@ -110,25 +517,31 @@ class DataManager:
             query += " AND a.date BETWEEN %s AND %s"
             params.extend([start_date, end_date])
 
-        return pd.read_sql_query(query, self.conn, params=params)
+        with self._read_pool().connection() as conn:
+            return read_frame(conn, query, params, name='get_attendance_report')
 
     def add_financial_record(self, record_data: dict):
         """Add a financial record for the current tenant."""
         self._check_tenant()
-        with self.conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO finance (
-                    tenant_id, date, type, category, amount, description
-                ) VALUES (%s, CURRENT_DATE, %s, %s, %s, %s)
-                """,
-                (
-                    self.tenant_id, record_data['type'], record_data['category'],
-                    record_data['amount'], record_data['description']
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO finance (
+                        tenant_id, date, type, category, amount, description
+                    ) VALUES (%s, CURRENT_DATE, %s, %s, %s, %s)
+                    RETURNING date, type, category, amount
+                    """,
+                    (
+                        self.tenant_id, record_data['type'], record_data['category'],
+                        record_data['amount'], record_data['description']
+                    )
                 )
-            )
-            self.conn.commit()
+                add_finance_rollups(cur, self.tenant_id, [(*cur.fetchone(), 1)])
+                conn.commit()
+                self._written('finance')
 
+    @cached_query('finance')
     def get_financial_summary(self) -> pd.DataFrame:
         """Get financial summary for the current tenant."""
         self._check_tenant()
@@ -138,7 +551,84 @@ class DataManager:
             WHERE tenant_id = %s
             ORDER BY date DESC
         """
-        return pd.read_sql_query(query, self.conn, params=(self.tenant_id,))
+        with self._read_pool().connection() as conn:
+            return read_frame(conn, query, (self.tenant_id,), name='get_financial_summary')
+
+    @cached_query('finance')
+    def get_recent_transactions(self, limit: int = 10) -> pd.DataFrame:
+        """Get the latest financial records for the current tenant."""
+        self._check_tenant()
+        query = """
+            SELECT date, type, category, amount, description
+            FROM finance
+            WHERE tenant_id = %s
+            ORDER BY date DESC, id DESC
+            LIMIT %s
+        """
+        with self._read_pool().connection() as conn:
+            return read_frame(conn, query, (self.tenant_id, limit), name='get_recent_transactions')
+
+    @cached_query('finance')
+    def get_finance_totals(self, start_date=None, end_date=None) -> pd.DataFrame:
+        """Get totals by type and category for a date range from the finance rollups.
+
+        Whole calendar months inside the range are read from finance_monthly
+        and the partial months at either end from finance_daily, so the cost
+        depends on the number of months rather than the number of records.
+        Without a range, all-time totals are returned.
+        """
+        self._check_tenant()
+        start, end, months_start, months_end = month_span(start_date, end_date)
+
+        params = {
+            'tenant_id': self.tenant_id,
+            'start': start,
+            'end': end,
+            'months_start': months_start,
+            'months_end': months_end,
+        }
+        with self._read_pool().connection() as conn:
+            return read_frame(conn, FINANCE_TOTALS_SQL, params, name='get_finance_totals')
+
+    @cached_query('finance')
+    def get_finance_series(self, start_date=None, end_date=None,
+                           max_points: int = MAX_CHART_POINTS) -> pd.DataFrame:
+        """Get income and expense per day, week or month for charting.
+
+        Bucketed in SQL from the daily rollup like ``get_attendance_series``,
+        with each type's series capped at ``max_points`` rows.
+        """
+        self._check_tenant()
+        start, end = self._rollup_range('finance_daily', start_date, end_date)
+        bucket = choose_bucket(start, end, max_points)
+        query = """
+            SELECT date_trunc(%(bucket)s, date)::date AS date, type, SUM(total) AS amount
+            FROM finance_daily
+            WHERE tenant_id = %(tenant_id)s AND date BETWEEN %(start)s AND %(end)s
+            GROUP BY 1, 2
+            ORDER BY 2, 1
+        """
+        params = {'tenant_id': self.tenant_id, 'bucket': bucket, 'start': start, 'end': end}
+
+        with self._read_pool().connection() as conn:
+            df = read_frame(conn, query, params, name='get_finance_series')
+        df = downsample(df, 'date', 'amount', max_points, group='type')
+        df.attrs['bucket'] = bucket
+        return df
+
+    def _rollup_range(self, table: str, start_date=None, end_date=None) -> tuple:
+        """Resolve a chart's date range, defaulting to the dates present in a rollup."""
+        if start_date and end_date:
+            return pd.Timestamp(start_date).date(), pd.Timestamp(end_date).date()
+        with self._read_pool().connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"SELECT MIN(date), MAX(date) FROM {table} WHERE tenant_id = %s",
+                    (self.tenant_id,)
+                )
+                first, last = cur.fetchone()
+        today = date.today()
+        return first or today, last or today
 
     def add_measurements(self, measurement_data: dict):
         """Add measurements for a member."""
@@ -146,23 +636,26 @@ class DataManager:
         height_m = measurement_data['height'] / 100
         bmi = measurement_data['weight'] / (height_m * height_m)
 
-        with self.conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO measurements (
-                    tenant_id, member_id, date, weight, height,
-                    chest, waist, arms, legs, bmi
-                ) VALUES (%s, %s, CURRENT_DATE, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    self.tenant_id, measurement_data['member_id'],
-                    measurement_data['weight'], measurement_data['height'],
-                    measurement_data['chest'], measurement_data['waist'],
-                    measurement_data['arms'], measurement_data['legs'], bmi
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO measurements (
+                        tenant_id, member_id, date, weight, height,
+                        chest, waist, arms, legs, bmi
+                    ) VALUES (%s, %s, CURRENT_DATE, %s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    (
+                        self.tenant_id, measurement_data['member_id'],
+                        measurement_data['weight'], measurement_data['height'],
+                        measurement_data['chest'], measurement_data['waist'],
+                        measurement_data['arms'], measurement_data['legs'], bmi
+                    )
                 )
-            )
-            self.conn.commit()
+                conn.commit()
+                self._written('measurements')
 
+    @cached_query('measurements')
     def get_measurements(self, member_id: int) -> pd.DataFrame:
         """Get measurements history for a member."""
         self._check_tenant()
@@ -172,41 +665,188 @@ class DataManager:
             WHERE tenant_id = %s AND member_id = %s
             ORDER BY date
         """
-        return pd.read_sql_query(query, self.conn, params=(self.tenant_id, member_id))
+        with self._read_pool().connection() as conn:
+            return read_frame(conn, query, (self.tenant_id, member_id), name='get_measurements')
 
-    def get_data(self) -> tuple:
-        """Get all necessary data for the dashboard."""
+    @cached_query('measurements')
+    def get_measurement_version(self, member_id: int) -> tuple:
+        """Get (latest measurement date, number of measurements) for a member.
+
+        A cheap index lookup that changes whenever the member's history
+        does, used to key caches of derived views such as progress charts.
+        """
         self._check_tenant()
+        with self._read_pool().connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT MAX(date), COUNT(*)
+                    FROM measurements
+                    WHERE tenant_id = %s AND member_id = %s
+                    """,
+                    (self.tenant_id, member_id)
+                )
+                return cur.fetchone()
 
-        # Get members data
-        members_query = """
-            SELECT id, name, email, phone, join_date,
-                   membership_type, status, emergency_contact
-            FROM members
-            WHERE tenant_id = %s
+    @cached_query('members', 'attendance', 'finance')
+    def get_dashboard_metrics(self) -> dict:
+        """Get the dashboard KPIs for the current tenant in a single round-trip."""
+        self._check_tenant()
+        query = """
+            SELECT
+                (SELECT COUNT(*) FROM members
+                 WHERE tenant_id = %(tenant_id)s) AS total_members,
+                (SELECT COUNT(*) FROM members
+                 WHERE tenant_id = %(tenant_id)s AND status = %(active_status)s) AS active_members,
+                (SELECT COALESCE(SUM(visits), 0) FROM attendance_daily
+                 WHERE tenant_id = %(tenant_id)s AND date = %(today)s) AS todays_attendance,
+                (SELECT COALESCE(SUM(total), 0) FROM finance_monthly
+                 WHERE tenant_id = %(tenant_id)s AND type = 'income') AS total_income
         """
+        params = {
+            'tenant_id': self.tenant_id,
+            'today': datetime.now().date(),
+            'active_status': ACTIVE_MEMBER_STATUS,
+        }
 
-        # Get finance data
-        finance_query = """
-            SELECT date, type, category, amount, description
-            FROM finance
-            WHERE tenant_id = %s
-            ORDER BY date DESC
+        with self._read_pool().connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, params)
+                row = cur.fetchone()
+        return {
+            'total_members': row['total_members'],
+            'active_members': row['active_members'],
+            'todays_attendance': row['todays_attendance'],
+            'total_income': float(row['total_income'])
+        }
+
+    def get_data(self, concurrent: bool = True, incremental: bool = True) -> tuple:
+        """Get all necessary data for the dashboard.
+
+        By default the frames are held per tenant and every call after the
+        first only fetches rows changed since the previous one (see
+        ``refresh_data``), so a call costs in proportion to the changes
+        rather than to the tables. These calls bypass the query cache; the
+        held frames already are the cache.
+
+        With ``incremental=False`` the tables are loaded in full and the
+        result is cached like other reads. The members, finance and
+        attendance queries are independent, so by default they run at the
+        same time on separate pooled connections. Per-query timings are
+        left in ``last_timings``; if any query fails, QueryFanoutError
+        reports each failure along with the results that did arrive.
         """
+        self._check_tenant()
+        if incremental:
+            return self.refresh_data(concurrent)
+        return self._load_data(concurrent)
 
-        # Get attendance data
-        attendance_query = """
-            SELECT a.date, a.check_in, a.check_out, m.name as member_name, a.member_id
-            FROM attendance a
-            JOIN members m ON a.member_id = m.id
-            WHERE a.tenant_id = %s
+    @cached_query('members', 'finance', 'attendance')
+    def _load_data(self, concurrent: bool = True) -> tuple:
+        """Load the dashboard frames in full, for ``get_data(incremental=False)``."""
+        queries = {
+            'members': """
+                SELECT id, name, email, phone, join_date,
+                       membership_type, status, emergency_contact
+                FROM members
+                WHERE tenant_id = %s
+            """,
+            'finance': """
+                SELECT date, type, category, amount, description
+                FROM finance
+                WHERE tenant_id = %s
+                ORDER BY date DESC
+            """,
+            'attendance': """
+                SELECT a.date, a.check_in, a.check_out, m.name as member_name, a.member_id
+                FROM attendance a
+                JOIN members m ON a.member_id = m.id
+                WHERE a.tenant_id = %s
+            """,
+        }
+        results = self.fetch_frames(
+            {name: (query, (self.tenant_id,)) for name, query in queries.items()},
+            concurrent=concurrent
+        )
+        return results['members'], results['finance'], results['attendance']
+
+    def refresh_data(self, concurrent: bool = True) -> tuple:
+        """Bring this tenant's held dashboard frames up to date and return copies.
+
+        The first call loads each table in full. Later calls fetch rows
+        whose ``updated_at`` is past the previous fetch (less an overlap
+        window) and merge them in by id. Rows fetched per frame are
+        left in ``last_delta_rows``. The store bounds how many tenants
+        and rows are held (``INCREMENTAL_MAX_TENANTS``,
+        ``INCREMENTAL_MAX_ROWS``); an evicted tenant's next call is a full
+        load. The app never deletes these rows, so deletions are not
+        tracked; ``get_delta_store().reset()`` forces a full reload.
         """
+        self._check_tenant()
+        store = get_delta_store()
+        lock, frames = store.tenant(self.tenant_id)
+        with lock:
+            if not frames:
+                frames['members'] = DeltaFrame()
+                frames['finance'] = DeltaFrame(sort_by='date', ascending=False)
+                frames['attendance'] = DeltaFrame()
+
+            fetched_at = pd.Timestamp.now(tz='UTC')
+            queries = {}
+            for name, (query, changed) in DELTA_QUERIES.items():
+                since = frames[name].since()
+                queries[name] = (
+                    query.format(changed='TRUE' if since is None else changed),
+                    {'tenant_id': self.tenant_id, 'since': since}
+                )
+            deltas = self.fetch_frames(queries, concurrent=concurrent)
+
+            for name, delta in deltas.items():
+                frames[name].merge(delta, fetched_at)
+            self.last_delta_rows = {name: len(delta) for name, delta in deltas.items()}
+            store.note_rows(self.tenant_id, sum(len(frame.frame) for frame in frames.values()))
+            return tuple(frames[name].frame[DATA_COLUMNS[name]] for name in ('members', 'finance', 'attendance'))
+
+    def fetch_frames(self, queries: dict, concurrent: bool = True) -> dict:
+        """Run independent read queries and return their DataFrames by name.
+
+        ``queries`` maps a name to a (sql, params) pair. With ``concurrent``
+        each query borrows its own pooled connection on a worker thread;
+        otherwise they run one after another on a single connection.
+        Timings in seconds are stored per name in ``last_timings``.
+        """
+        results, errors, timings = {}, {}, {}
+        pool = self._read_pool()
+
+        def run(name, conn):
+            started = time.perf_counter()
+            try:
+                query, params = queries[name]
+                results[name] = read_frame(conn, query, params, name=name)
+            except Exception as e:
+                errors[name] = e
+            finally:
+                timings[name] = round(time.perf_counter() - started, 4)
+
+        def run_pooled(name):
+            try:
+                with pool.connection() as conn:
+                    run(name, conn)
+            except Exception as e:  # e.g. timed out waiting for a connection
+                errors[name] = e
+
+        if concurrent and len(queries) > 1:
+            with ThreadPoolExecutor(max_workers=len(queries), thread_name_prefix='query-fanout') as executor:
+                list(executor.map(run_pooled, queries))
+        else:
+            with pool.connection() as conn:
+                for name in queries:
+                    run(name, conn)
+                    if name in errors:
+                        # A failed statement aborts the transaction for the rest
+                        conn.rollback()
 
-        try:
-            members_df = pd.read_sql_query(members_query, self.conn, params=(self.tenant_id,))
-            finance_df = pd.read_sql_query(finance_query, self.conn, params=(self.tenant_id,))
-            attendance_df = pd.read_sql_query(attendance_query, self.conn, params=(self.tenant_id,))
-            return members_df, finance_df, attendance_df
-        except Exception as e:
-            print(f"Error fetching data: {str(e)}")
-            return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
\ No newline at end of file
+        self.last_timings = timings
+        if errors:
+            raise QueryFanoutError(errors, results, timings)
+        return results
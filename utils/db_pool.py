@@ -0,0 +1,217 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+class ConnectionPool:
+    """Thread-safe pool of Postgres connections shared by all managers."""
+
+    def __init__(self, dsn: str, minconn: int = 1, maxconn: int = 10,
+                 timeout: float = 30.0, check_after: float = 30.0):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Pool size must satisfy 0 <= minconn <= maxconn and maxconn >= 1")
+        self.dsn = dsn
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.check_after = check_after
+        self._idle = []
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._counters = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'connections_opened': 0,
+            'connections_discarded': 0,
+            'health_check_failures': 0,
+        }
+
+        for _ in range(minconn):
+            self._idle.append((self._connect(), time.monotonic()))
+
+    def _connect(self):
+        """Open a new physical connection."""
+        conn = psycopg2.connect(self.dsn)
+        with self._cond:
+            self._counters['connections_opened'] += 1
+        return conn
+
+    def _discard(self, conn):
+        """Close a connection that must not go back into the pool."""
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+        with self._cond:
+            self._counters['connections_discarded'] += 1
+
+    def _is_healthy(self, conn, idle_since: float) -> bool:
+        """Check a connection before handing it out.
+
+        Closed connections and connections left inside a transaction are
+        always rejected; connections idle for longer than ``check_after``
+        seconds are additionally pinged with ``SELECT 1``.
+        """
+        if conn.closed:
+            return False
+        if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        if time.monotonic() - idle_since < self.check_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        """Borrow a connection, waiting up to ``timeout`` seconds for one to free up."""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolError("Connection pool is closed")
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                    break
+                if self._in_use + len(self._idle) < self.maxconn:
+                    conn, idle_since = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise PoolError("Timed out waiting for a database connection")
+                self._counters['waits'] += 1
+                self._cond.wait(remaining)
+            self._in_use += 1
+            self._counters['checkouts'] += 1
+
+        try:
+            if conn is not None and not self._is_healthy(conn, idle_since):
+                with self._cond:
+                    self._counters['health_check_failures'] += 1
+                self._discard(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return conn
+
+    def putconn(self, conn, discard: bool = False):
+        """Return a borrowed connection, rolling back any open transaction."""
+        if not discard and not conn.closed:
+            if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            keep = not (discard or conn.closed or self._closed)
+            if keep:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+        if not keep:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a ``with`` block."""
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def stats(self) -> dict:
+        """Return a snapshot of pool size and usage counters."""
+        with self._cond:
+            return {
+                'minconn': self.minconn,
+                'maxconn': self.maxconn,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'total': len(self._idle) + self._in_use,
+                **self._counters,
+            }
+
+    def closeall(self):
+        """Close idle connections and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._discard(conn)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """Get the process-wide pool, creating it from the environment on first use.
+
+    Sizing is configured with ``DB_POOL_MIN`` / ``DB_POOL_MAX``, the checkout
+    wait with ``DB_POOL_TIMEOUT`` and the idle time after which a connection
+    is pinged with ``DB_POOL_CHECK_AFTER`` (all optional).
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    os.environ['DATABASE_URL'],
+                    minconn=int(os.environ.get('DB_POOL_MIN', 1)),
+                    maxconn=int(os.environ.get('DB_POOL_MAX', 10)),
+                    timeout=float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+                    check_after=float(os.environ.get('DB_POOL_CHECK_AFTER', 30)),
+                )
+    return _pool
+
+_replica_pool = None
+
+def get_replica_pool():
+    """Get the process-wide read-replica pool, or None if no replica is configured.
+
+    The replica is given by ``REPLICA_DATABASE_URL`` and sized with the
+    same settings as the primary pool.
+    """
+    global _replica_pool
+    dsn = os.environ.get('REPLICA_DATABASE_URL')
+    if not dsn:
+        return None
+    if _replica_pool is None:
+        with _pool_lock:
+            if _replica_pool is None:
+                _replica_pool = ConnectionPool(
+                    dsn,
+                    minconn=int(os.environ.get('DB_POOL_MIN', 1)),
+                    maxconn=int(os.environ.get('DB_POOL_MAX', 10)),
+                    timeout=float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+                    check_after=float(os.environ.get('DB_POOL_CHECK_AFTER', 30)),
+                )
+    return _replica_pool
+
+def pool_stats() -> dict:
+    """Get usage statistics for the process-wide pool."""
+    return get_pool().stats()
+
+def close_pool():
+    """Close the process-wide pools so the next ``get_pool()`` builds a fresh one."""
+    global _pool, _replica_pool
+    with _pool_lock:
+        for pool in (_pool, _replica_pool):
+            if pool is not None:
+                pool.closeall()
+        _pool = _replica_pool = None
@@ -0,0 +1,275 @@
+import argparse
+import csv
+import io
+import os
+import shlex
+import sys
+import tempfile
+import uuid
+from decimal import Decimal
+from utils.read_routing import get_read_router
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+# st.download_button holds the whole file in memory, so exports made from
+# the app are capped; larger ones are pointed at the CLI below
+APP_EXPORT_MAX_ROWS = int(os.environ.get('APP_EXPORT_MAX_ROWS', 100000))
+
+EXPORT_MIME_TYPES = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+EXPORT_QUERIES = {
+    'members': """
+        SELECT id, name, email, phone, join_date,
+               membership_type, status, emergency_contact
+        FROM members
+        WHERE tenant_id = %(tenant_id)s
+        ORDER BY id
+    """,
+    'attendance': """
+        SELECT a.date, a.check_in, a.check_out, a.member_id, m.name as member_name
+        FROM attendance a
+        JOIN members m ON a.member_id = m.id
+        WHERE a.tenant_id = %(tenant_id)s
+        AND a.date BETWEEN %(start_date)s AND %(end_date)s
+        ORDER BY a.date, a.check_in
+    """,
+    'finance': """
+        SELECT date, type, category, amount, description
+        FROM finance
+        WHERE tenant_id = %(tenant_id)s
+        AND date BETWEEN %(start_date)s AND %(end_date)s
+        ORDER BY date, id
+    """,
+    'measurements': """
+        SELECT date, weight, height, chest, waist, arms, legs, bmi
+        FROM measurements
+        WHERE tenant_id = %(tenant_id)s AND member_id = %(member_id)s
+        ORDER BY date
+    """,
+}
+
+# Postgres type OIDs -> Arrow types for Parquet output (anything else is written as text)
+_ARROW_TYPES = {
+    16: 'bool_',
+    20: 'int64',
+    21: 'int16',
+    23: 'int32',
+    700: 'float32',
+    701: 'float64',
+    1700: 'float64',
+    1082: 'date32',
+    1083: 'time64',
+    1114: 'timestamp',
+}
+
+def export_formats() -> list:
+    """Get the export formats available in this installation."""
+    return ['csv', 'parquet'] if pa is not None else ['csv']
+
+class ExportManager:
+    """Stream tenant data out of Postgres through named server-side cursors.
+
+    Rows are fetched ``chunk_size`` at a time and written straight to the
+    output, so memory use does not grow with the size of the export.
+    """
+
+    def __init__(self, tenant_id: int, chunk_size: int = 5000):
+        if not tenant_id:
+            raise ValueError("Tenant ID is required for this operation")
+        self.tenant_id = tenant_id
+        self.chunk_size = chunk_size
+        self.router = get_read_router()
+
+    def export_members(self, fmt: str = 'csv', max_rows: int = None):
+        """Export the tenant's members."""
+        return self.export('members', fmt, max_rows=max_rows)
+
+    def export_attendance(self, start_date, end_date, fmt: str = 'csv', max_rows: int = None):
+        """Export attendance rows within a date range."""
+        return self.export('attendance', fmt, max_rows=max_rows,
+                           start_date=start_date, end_date=end_date)
+
+    def export_finance(self, start_date, end_date, fmt: str = 'csv', max_rows: int = None):
+        """Export financial records within a date range."""
+        return self.export('finance', fmt, max_rows=max_rows,
+                           start_date=start_date, end_date=end_date)
+
+    def export_measurements(self, member_id: int, fmt: str = 'csv', max_rows: int = None):
+        """Export a member's measurement history."""
+        return self.export('measurements', fmt, max_rows=max_rows, member_id=member_id)
+
+    def count_rows(self, kind: str, **params) -> int:
+        """Count the rows an export would contain."""
+        if kind not in EXPORT_QUERIES:
+            raise ValueError(f"Unsupported export: {kind}")
+        with self.router.pool_for_read(self.tenant_id).connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"SELECT COUNT(*) FROM ({EXPORT_QUERIES[kind]}) export",
+                            {'tenant_id': self.tenant_id, **params})
+                return cur.fetchone()[0]
+
+    def export(self, kind: str, fmt: str = 'csv', max_rows: int = None, **params):
+        """Write an export to a temporary file on disk and return it rewound.
+
+        The returned raw file object can be passed directly to
+        ``st.download_button``; it is deleted once closed. With
+        ``max_rows``, larger exports raise ValueError naming the CLI
+        command that writes them instead.
+        """
+        if kind not in EXPORT_QUERIES:
+            raise ValueError(f"Unsupported export: {kind}")
+        if fmt not in export_formats():
+            raise ValueError(f"Unsupported export format: {fmt}")
+        if max_rows is not None:
+            rows = self.count_rows(kind, **params)
+            if rows > max_rows:
+                raise ValueError(
+                    f"This export has {rows:,} rows, more than the {max_rows:,} that can be "
+                    f"downloaded here. Ask an administrator to run: {self.cli_command(kind, fmt, **params)}"
+                )
+
+        raw = tempfile.TemporaryFile(buffering=0)
+        out = io.BufferedWriter(raw)
+        chunks = self.iter_chunks(EXPORT_QUERIES[kind], {'tenant_id': self.tenant_id, **params})
+        if fmt == 'csv':
+            for block in self._csv_blocks(chunks):
+                out.write(block)
+        else:
+            self._write_parquet(chunks, out)
+        out.flush()
+        out.detach()
+        raw.seek(0)
+        return raw
+
+    def cli_command(self, kind: str, fmt: str = 'csv', **params) -> str:
+        """The ``python -m utils.export_manager`` command line producing the same export."""
+        args = ['python', '-m', 'utils.export_manager', '--tenant-id', str(self.tenant_id),
+                '--kind', kind, '--format', fmt]
+        for name, value in params.items():
+            args += [f"--{name.replace('_', '-')}", str(value)]
+        args += ['--output', f"{kind}_export.{fmt}"]
+        return shlex.join(args)
+
+    def stream_csv(self, kind: str, **params):
+        """Yield an export as encoded CSV blocks, for streaming HTTP responses."""
+        if kind not in EXPORT_QUERIES:
+            raise ValueError(f"Unsupported export: {kind}")
+        chunks = self.iter_chunks(EXPORT_QUERIES[kind], {'tenant_id': self.tenant_id, **params})
+        yield from self._csv_blocks(chunks)
+
+    def iter_chunks(self, sql: str, params: dict):
+        """Yield (description, rows) chunks read through a named server-side cursor."""
+        with self.router.pool_for_read(self.tenant_id).connection() as conn:
+            with conn.cursor(name=f"export_{uuid.uuid4().hex}") as cur:
+                cur.itersize = self.chunk_size
+                cur.execute(sql, params)
+                # The first chunk is yielded even when empty so writers get the columns
+                rows = cur.fetchmany(self.chunk_size)
+                yield cur.description, rows
+                while rows:
+                    rows = cur.fetchmany(self.chunk_size)
+                    if rows:
+                        yield cur.description, rows
+
+    def _csv_blocks(self, chunks):
+        """Encode chunks as CSV, one block per chunk with the header first."""
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        header_written = False
+        for description, rows in chunks:
+            if not header_written:
+                writer.writerow([column.name for column in description])
+                header_written = True
+            writer.writerows(rows)
+            yield buf.getvalue().encode()
+            buf.seek(0)
+            buf.truncate()
+
+    def _write_parquet(self, chunks, out):
+        """Write chunks as row groups of a single Parquet file."""
+        writer = None
+        try:
+            for description, rows in chunks:
+                if writer is None:
+                    schema = pa.schema([
+                        (column.name, self._arrow_type(column.type_code)) for column in description
+                    ])
+                    writer = pq.ParquetWriter(out, schema)
+                if not rows:
+                    continue
+                columns = list(zip(*rows))
+                arrays = [
+                    pa.array(self._arrow_values(values, field.type), type=field.type)
+                    for values, field in zip(columns, schema)
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        finally:
+            if writer is not None:
+                writer.close()
+
+    @staticmethod
+    def _arrow_type(type_code: int):
+        name = _ARROW_TYPES.get(type_code)
+        if name == 'time64':
+            return pa.time64('us')
+        if name == 'timestamp':
+            return pa.timestamp('us')
+        if name is None:
+            return pa.string()
+        return getattr(pa, name)()
+
+    @staticmethod
+    def _arrow_values(values, arrow_type):
+        """Convert driver values Arrow won't take as-is (Decimal, JSON, ...)."""
+        if pa.types.is_floating(arrow_type):
+            return [float(v) if isinstance(v, Decimal) else v for v in values]
+        if pa.types.is_string(arrow_type):
+            return [v if v is None or isinstance(v, str) else str(v) for v in values]
+        return values
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a tenant's data without the app's size cap.")
+    parser.add_argument('--tenant-id', type=int, required=True)
+    parser.add_argument('--kind', choices=sorted(EXPORT_QUERIES), required=True)
+    parser.add_argument('--format', choices=export_formats(), default='csv')
+    parser.add_argument('--start-date', help="attendance and finance exports")
+    parser.add_argument('--end-date', help="attendance and finance exports")
+    parser.add_argument('--member-id', type=int, help="measurements export")
+    parser.add_argument('--output', help="file to write (default: CSV to stdout)")
+    args = parser.parse_args()
+
+    params = {}
+    if args.kind in ('attendance', 'finance'):
+        if not (args.start_date and args.end_date):
+            parser.error(f"--start-date and --end-date are required for {args.kind}")
+        params = {'start_date': args.start_date, 'end_date': args.end_date}
+    elif args.kind == 'measurements':
+        if args.member_id is None:
+            parser.error("--member-id is required for measurements")
+        params = {'member_id': args.member_id}
+
+    manager = ExportManager(args.tenant_id)
+    if args.output is None:
+        if args.format != 'csv':
+            parser.error("--output is required for parquet")
+        for block in manager.stream_csv(args.kind, **params):
+            sys.stdout.buffer.write(block)
+        return
+
+    with manager.export(args.kind, args.format, **params) as exported, open(args.output, 'wb') as f:
+        while True:
+            block = exported.read(1 << 20)
+            if not block:
+                break
+            f.write(block)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+import os
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+# Each refresh asks for rows changed since the previous one started, less
+# this many seconds: ``updated_at`` is set when a transaction starts, so a
+# write still in flight when the previous fetch ran carries an earlier
+# timestamp. The window also absorbs replica lag and clock skew between
+# the app and database servers.
+INCREMENTAL_OVERLAP = float(os.environ.get('INCREMENTAL_OVERLAP', 60))
+
+class DeltaFrame:
+    """A query result kept current by merging in rows changed since the last refresh.
+
+    Rows are identified by ``key``. The high-water mark is the time the
+    last fetch started; ``merge`` replaces held rows by key and appends new
+    ones, so fetching an overlapping window again is harmless.
+    """
+
+    def __init__(self, key: str = 'id', sort_by: str = None, ascending: bool = True):
+        self.key = key
+        self.sort_by = sort_by
+        self.ascending = ascending
+        self.frame = None
+        self.high_water = None
+
+    def since(self):
+        """Lower bound for the next delta query, or None if a full load is needed."""
+        if self.high_water is None:
+            return None
+        return self.high_water - pd.Timedelta(seconds=INCREMENTAL_OVERLAP)
+
+    def merge(self, delta: pd.DataFrame, fetched_at: pd.Timestamp):
+        """Fold a full load (first call) or a delta fetched at ``fetched_at`` into the held frame."""
+        self.high_water = fetched_at
+        if self.frame is None:
+            merged = delta
+        elif delta.empty:
+            return
+        else:
+            held = self.frame
+            for column in held.columns:
+                # Widen categoricals to cover both sides so concat keeps the dtype
+                if isinstance(held[column].dtype, pd.CategoricalDtype) and column in delta:
+                    new = delta[column].astype('category').cat.categories.difference(
+                        held[column].cat.categories
+                    )
+                    if len(new):
+                        held[column] = held[column].cat.add_categories(new)
+                    delta = delta.assign(**{column: delta[column].astype(held[column].dtype)})
+            changed = held[self.key].isin(delta[self.key])
+            merged = pd.concat([held[~changed], delta], ignore_index=True)
+
+        if self.sort_by is not None:
+            merged = merged.sort_values(self.sort_by, ascending=self.ascending,
+                                        kind='stable', ignore_index=True)
+        self.frame = merged
+
+class DeltaStore:
+    """Per-tenant DeltaFrames, keeping the most recently used tenants.
+
+    At most ``max_tenants`` tenants are held, and at most ``max_rows`` rows
+    across all of them; least recently used tenants are dropped first.
+    """
+
+    def __init__(self, max_tenants: int = 64, max_rows: int = 2_000_000):
+        self.max_tenants = max_tenants
+        self.max_rows = max_rows
+        self._tenants = OrderedDict()
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def tenant(self, tenant_id: int) -> tuple:
+        """Get (lock, frames by name) for a tenant; hold the lock while refreshing."""
+        with self._lock:
+            entry = self._tenants.get(tenant_id)
+            if entry is None:
+                entry = self._tenants[tenant_id] = (threading.Lock(), {})
+                while len(self._tenants) > self.max_tenants:
+                    self._evict(next(iter(self._tenants)))
+            else:
+                self._tenants.move_to_end(tenant_id)
+            return entry
+
+    def note_rows(self, tenant_id: int, rows: int):
+        """Record how many rows a tenant's frames hold, evicting to stay within ``max_rows``.
+
+        If the tenant alone is over the limit it is dropped too, so its
+        next refresh is a full load.
+        """
+        with self._lock:
+            if tenant_id not in self._tenants:
+                return
+            self._rows[tenant_id] = rows
+            while self._tenants and sum(self._rows.values()) > self.max_rows:
+                self._evict(next(iter(self._tenants)))
+
+    def reset(self, tenant_id: int = None):
+        """Forget held frames for one tenant, or all, forcing full reloads."""
+        with self._lock:
+            if tenant_id is None:
+                self._tenants.clear()
+                self._rows.clear()
+            else:
+                self._evict(tenant_id)
+
+    def _evict(self, tenant_id: int):
+        self._tenants.pop(tenant_id, None)
+        self._rows.pop(tenant_id, None)
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_delta_store() -> DeltaStore:
+    """Get the process-wide store, sized by ``INCREMENTAL_MAX_TENANTS`` and ``INCREMENTAL_MAX_ROWS``."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = DeltaStore(
+                    max_tenants=int(os.environ.get('INCREMENTAL_MAX_TENANTS', 64)),
+                    max_rows=int(os.environ.get('INCREMENTAL_MAX_ROWS', 2_000_000)),
+                )
+    return _store
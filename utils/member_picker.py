@@ -0,0 +1,33 @@
+import os
+import streamlit as st
+
+# Rosters up to this size are offered whole; larger ones are searched by name
+MEMBER_PICKER_LIMIT = int(os.environ.get('MEMBER_PICKER_LIMIT', 1000))
+
+def select_member(dm, label: str = "Select Member", key: str = None):
+    """Member selectbox backed by the DataManager member directory.
+
+    Returns the chosen member id, or None if there is nothing to choose.
+    Names are looked up in the id -> name map, so rendering is linear in the
+    number of options. Large rosters get a name search first and only its
+    matches become options.
+    """
+    directory = dm.get_member_directory()
+
+    if len(directory) <= MEMBER_PICKER_LIMIT:
+        options = directory
+    else:
+        prefix = st.text_input(
+            "Search Members",
+            key=f"{key}_search" if key else None,
+            placeholder="Type the start of a name"
+        )
+        if not prefix.strip():
+            st.caption(f"{len(directory):,} members; type a name to search.")
+            return None
+        options = dict(dm.lookup_members(prefix, limit=50))
+        if not options:
+            st.info("No members match that name.")
+            return None
+
+    return st.selectbox(label, options=list(options), format_func=options.get, key=key)
@@ -0,0 +1,264 @@
+import bisect
+import functools
+import inspect
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class MethodMetrics:
+    """Latency histogram and row/byte totals for one manager method and tenant."""
+
+    __slots__ = ('buckets', 'count', 'seconds', 'rows', 'bytes', 'errors')
+
+    def __init__(self, bucket_count: int):
+        # One slot per bucket plus the +Inf overflow
+        self.buckets = [0] * (bucket_count + 1)
+        self.count = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.errors = 0
+
+class MetricsRegistry:
+    """Thread-safe per-(manager, method, tenant) call metrics.
+
+    Recording a call is a bisect and a few additions under a lock, cheap
+    enough to leave on for every manager method.
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, manager: str, method: str, tenant_id, seconds: float,
+                rows: int = 0, nbytes: int = 0, error: bool = False):
+        """Record one call."""
+        key = (manager, method, '' if tenant_id is None else str(tenant_id))
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = MethodMetrics(len(self.buckets))
+            series.buckets[index] += 1
+            series.count += 1
+            series.seconds += seconds
+            series.rows += rows
+            series.bytes += nbytes
+            if error:
+                series.errors += 1
+
+    def snapshot(self) -> list:
+        """Get one dict per (manager, method, tenant) with its counters and histogram."""
+        with self._lock:
+            items = [
+                (key, list(series.buckets), series.count, series.seconds,
+                 series.rows, series.bytes, series.errors)
+                for key, series in self._series.items()
+            ]
+        return [
+            {
+                'manager': manager, 'method': method, 'tenant': tenant,
+                'calls': count, 'errors': errors, 'seconds': seconds,
+                'rows': rows, 'bytes': nbytes, 'buckets': buckets,
+            }
+            for (manager, method, tenant), buckets, count, seconds, rows, nbytes, errors in sorted(items)
+        ]
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._series.clear()
+
+    def quantile(self, buckets: list, q: float) -> float:
+        """Estimate a latency quantile (seconds) from histogram bucket counts."""
+        total = sum(buckets)
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        lower = 0.0
+        for upper, count in zip(self.buckets + (float('inf'),), buckets):
+            if count and seen + count >= rank:
+                if upper == float('inf'):
+                    return lower
+                # Interpolate linearly within the bucket, as Prometheus does
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper
+        return lower
+
+    def render_prometheus(self) -> str:
+        """Render the recorded metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP gymflow_method_duration_seconds Manager method latency.",
+            "# TYPE gymflow_method_duration_seconds histogram",
+        ]
+        snapshot = self.snapshot()
+        for entry in snapshot:
+            labels = _labels(entry)
+            cumulative = 0
+            for upper, count in zip(self.buckets, entry['buckets']):
+                cumulative += count
+                lines.append(f'gymflow_method_duration_seconds_bucket{{{labels},le="{upper}"}} {cumulative}')
+            lines.append(f'gymflow_method_duration_seconds_bucket{{{labels},le="+Inf"}} {entry["calls"]}')
+            lines.append(f'gymflow_method_duration_seconds_sum{{{labels}}} {entry["seconds"]:.6f}')
+            lines.append(f'gymflow_method_duration_seconds_count{{{labels}}} {entry["calls"]}')
+
+        for name, field, help_text in (
+            ('gymflow_method_rows_total', 'rows', 'Rows returned by manager methods.'),
+            ('gymflow_method_bytes_total', 'bytes', 'DataFrame bytes returned by manager methods.'),
+            ('gymflow_method_errors_total', 'errors', 'Manager method calls that raised.'),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{{{_labels(entry)}}} {entry[field]}" for entry in snapshot)
+
+        lines.extend(_stats_gauges())
+        return "\n".join(lines) + "\n"
+
+def _labels(entry: dict) -> str:
+    return ','.join(
+        f'{name}="{_escape(entry[name])}"' for name in ('manager', 'method', 'tenant')
+    )
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _stats_gauges() -> list:
+    """Connection pool, query cache and read routing statistics as gauges."""
+    from utils.db_pool import pool_stats
+    from utils.query_cache import cache_stats
+    from utils.read_routing import get_read_router
+
+    lines = []
+    for prefix, stats in (('gymflow_pool', pool_stats), ('gymflow_query_cache', cache_stats),
+                          ('gymflow_read_router', get_read_router().stats)):
+        try:
+            values = stats()
+        except Exception:
+            continue
+        for key, value in values.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append(f"# TYPE {prefix}_{key} gauge")
+                lines.append(f"{prefix}_{key} {value}")
+    return lines
+
+def result_size(result) -> tuple:
+    """Estimate (rows, bytes) for a manager method's return value.
+
+    DataFrames count their rows and column buffers (shallow, so the cost
+    stays in microseconds whatever the string lengths). Sequences holding
+    DataFrames, like ``get_data``'s tuple, add up their frames; other
+    sequences count their items. Maps keyed by id (``get_member_directory``)
+    count their entries, while a record keyed by column name is one row.
+    """
+    if isinstance(result, pd.DataFrame):
+        return len(result), int(sum(column.nbytes for _, column in result.items()))
+    if isinstance(result, (list, tuple)):
+        frames = [item for item in result if isinstance(item, pd.DataFrame)]
+        if not frames:
+            return len(result), 0
+        sizes = [result_size(frame) for frame in frames]
+        return sum(rows for rows, _ in sizes), sum(nbytes for _, nbytes in sizes)
+    if isinstance(result, dict):
+        if result and all(isinstance(key, str) for key in result):
+            return 1, 0
+        return len(result), 0
+    return 0, 0
+
+_registry = None
+_registry_lock = threading.Lock()
+_server = None
+
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry.
+
+    If ``METRICS_PORT`` is set, the first call also starts the Prometheus
+    endpoint on that port (bound to ``METRICS_ADDR``, default 127.0.0.1).
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+                port = os.environ.get('METRICS_PORT')
+                if port:
+                    start_metrics_server(int(port), os.environ.get('METRICS_ADDR', '127.0.0.1'))
+    return _registry
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = get_metrics().render_prometheus().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_metrics_server(port: int, addr: str = '127.0.0.1'):
+    """Serve ``/metrics`` from a daemon thread, once per process."""
+    global _server
+    if _server is not None:
+        return _server
+    _server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+    threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True).start()
+    return _server
+
+def instrument(cls):
+    """Class decorator recording latency, rows and bytes for every public method.
+
+    Calls are labeled with the class name, method name and the instance's
+    ``tenant_id`` (empty for managers that are not tenant-scoped). Setting
+    ``METRICS_ENABLED=0`` leaves the class untouched.
+    """
+    if os.environ.get('METRICS_ENABLED', '1') == '0':
+        return cls
+    for name, member in list(vars(cls).items()):
+        if name.startswith('_') or not inspect.isfunction(member):
+            continue
+        setattr(cls, name, _instrumented(cls.__name__, name, member))
+    return cls
+
+def _instrumented(manager: str, name: str, method):
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = await method(self, *args, **kwargs)
+            except Exception:
+                get_metrics().observe(manager, name, getattr(self, 'tenant_id', None),
+                                      time.perf_counter() - started, error=True)
+                raise
+            rows, nbytes = result_size(result)
+            get_metrics().observe(manager, name, getattr(self, 'tenant_id', None),
+                                  time.perf_counter() - started, rows, nbytes)
+            return result
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        except Exception:
+            get_metrics().observe(manager, name, getattr(self, 'tenant_id', None),
+                                  time.perf_counter() - started, error=True)
+            raise
+        rows, nbytes = result_size(result)
+        get_metrics().observe(manager, name, getattr(self, 'tenant_id', None),
+                              time.perf_counter() - started, rows, nbytes)
+        return result
+    return wrapper
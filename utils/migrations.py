@@ -0,0 +1,108 @@
+import argparse
+import re
+from pathlib import Path
+from utils.db_pool import get_pool
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / 'migrations'
+MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+# Arbitrary constant identifying the migration lock among advisory locks
+MIGRATION_LOCK_ID = 727_001
+
+def discover_migrations(directory: Path = MIGRATIONS_DIR) -> list:
+    """List the migration files as (version, name, path), ordered by version."""
+    migrations = []
+    for path in directory.glob('*.sql'):
+        match = MIGRATION_FILE.match(path.name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), path))
+    migrations.sort()
+
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError("Duplicate migration version in " + str(directory))
+    return migrations
+
+def _ensure_version_table(cur):
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+
+def applied_versions() -> set:
+    """Get the versions already recorded in ``schema_migrations``."""
+    with get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            _ensure_version_table(cur)
+            cur.execute("SELECT version FROM schema_migrations")
+            versions = {row[0] for row in cur.fetchall()}
+        conn.commit()
+        return versions
+
+def migrate(target: int = None) -> list:
+    """Apply pending migrations up to ``target`` (default: latest).
+
+    Each migration runs in its own transaction together with its
+    ``schema_migrations`` row, so a failure leaves the schema at the last
+    good version. An advisory lock keeps concurrent app starts from
+    applying the same migration twice. Returns the names applied.
+    """
+    applied = []
+    with get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+            try:
+                _ensure_version_table(cur)
+                conn.commit()
+                cur.execute("SELECT version FROM schema_migrations")
+                done = {row[0] for row in cur.fetchall()}
+
+                for version, name, path in discover_migrations():
+                    if target is not None and version > target:
+                        break
+                    if version in done:
+                        continue
+                    try:
+                        cur.execute(path.read_text())
+                        cur.execute(
+                            "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                            (version, name)
+                        )
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+                    applied.append(f"{version:04d}_{name}")
+            finally:
+                conn.rollback()
+                cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+                conn.commit()
+    return applied
+
+def main():
+    parser = argparse.ArgumentParser(description="Create or upgrade the GymFlow database schema.")
+    parser.add_argument('--target', type=int, help="migrate up to this version only")
+    parser.add_argument('--status', action='store_true', help="list migrations and exit")
+    args = parser.parse_args()
+
+    if args.status:
+        done = applied_versions()
+        for version, name, _ in discover_migrations():
+            state = 'applied' if version in done else 'pending'
+            print(f"{version:04d}_{name}: {state}")
+        return
+
+    applied = migrate(args.target)
+    if applied:
+        for name in applied:
+            print(f"Applied {name}")
+    else:
+        print("Schema is up to date")
+
+if __name__ == '__main__':
+    main()
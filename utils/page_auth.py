@@ -1,11 +1,20 @@
 import streamlit as st
+from utils.auth_manager import AuthManager
 
 def require_auth():
     """
     Protect a page by requiring authentication.
     Must be called at the start of each protected page.
+    The stored session is re-validated on every run; AuthManager caches
+    valid sessions briefly, so this rarely reaches the database.
     """
     if 'user' not in st.session_state:
         st.switch_page("pages/Login.py")
 
+    try:
+        AuthManager().validate_session(st.session_state.user['session_id'])
+    except ValueError:
+        del st.session_state.user
+        st.switch_page("pages/Login.py")
+
     return st.session_state.user
\ No newline at end of file
@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import secrets
+import statistics
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# Profiling is opt-in: PAGE_PROFILE=1 appends one JSON line per page rerun
+PROFILE_ENABLED = os.environ.get('PAGE_PROFILE') == '1'
+PROFILE_LOG = os.environ.get('PAGE_PROFILE_LOG', 'page_profile.jsonl')
+
+_log_lock = threading.Lock()
+
+class PageProfile:
+    """Timing breakdown of one page rerun.
+
+    ``section()`` blocks may nest; each is recorded under its stack of
+    enclosing section names with its inclusive time. ``finish()`` appends
+    the rerun to the profile log as one JSON line.
+    """
+
+    def __init__(self, page: str, session: str = None, log_path: str = PROFILE_LOG):
+        self.page = page
+        self.session = session
+        self.log_path = log_path
+        self.started_at = datetime.now()
+        self.started = time.perf_counter()
+        self.sections = []
+        self._stack = []
+        self.finished = False
+
+    @contextmanager
+    def section(self, name: str):
+        """Time the enclosed block as ``name``."""
+        self._stack.append(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections.append({
+                'stack': ';'.join(self._stack),
+                'ms': round((time.perf_counter() - started) * 1000, 3),
+            })
+            self._stack.pop()
+
+    def finish(self, complete: bool = True):
+        """Write the rerun to the log once.
+
+        Reruns cut short by ``st.stop()``, a page switch or an error are
+        written by the next rerun of the session with ``complete: false``.
+        """
+        if self.finished:
+            return
+        self.finished = True
+        record = {
+            'page': self.page,
+            'session': self.session,
+            'started_at': self.started_at.isoformat(timespec='milliseconds'),
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 3),
+            'complete': complete,
+            'sections': self.sections,
+        }
+        if not complete:
+            # The rerun really ended when its last section did
+            record['total_ms'] = round(sum(
+                s['ms'] for s in self.sections if ';' not in s['stack']
+            ), 3)
+        line = json.dumps(record) + '\n'
+        with _log_lock:
+            with open(self.log_path, 'a') as f:
+                f.write(line)
+
+class _DisabledProfile:
+    """Stand-in used when profiling is off; sections cost one call."""
+
+    def section(self, name: str):
+        return nullcontext()
+
+    def finish(self, complete: bool = True):
+        pass
+
+_DISABLED = _DisabledProfile()
+
+def start_page(page: str):
+    """Start profiling a rerun of ``page``; a no-op unless ``PAGE_PROFILE=1``.
+
+    Call it first thing in the page script, wrap its parts in
+    ``profile.section(...)`` and call ``profile.finish()`` at the end.
+    """
+    if not PROFILE_ENABLED:
+        return _DISABLED
+
+    import streamlit as st
+
+    previous = st.session_state.get('_page_profile')
+    if previous is not None:
+        previous.finish(complete=False)
+    if '_page_profile_session' not in st.session_state:
+        st.session_state['_page_profile_session'] = secrets.token_hex(4)
+    profile = PageProfile(page, session=st.session_state['_page_profile_session'])
+    st.session_state['_page_profile'] = profile
+    return profile
+
+def read_profiles(path: str = PROFILE_LOG, page: str = None) -> list:
+    """Read logged reruns, optionally for a single page."""
+    records = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if page is None or record['page'] == page:
+                records.append(record)
+    return records
+
+def self_times(record: dict) -> dict:
+    """Exclusive time per stack of one rerun, including the page's own code.
+
+    Time not spent in any section is attributed to the page itself (the
+    root stack), so the values add up to the rerun's total.
+    """
+    inclusive = {}
+    for section in record['sections']:
+        inclusive[section['stack']] = inclusive.get(section['stack'], 0.0) + section['ms']
+
+    exclusive = {}
+    children = {}
+    for stack, ms in inclusive.items():
+        parent = stack.rpartition(';')[0]
+        children[parent] = children.get(parent, 0.0) + ms
+    for stack, ms in inclusive.items():
+        exclusive[f"{record['page']};{stack}"] = max(ms - children.get(stack, 0.0), 0.0)
+    exclusive[record['page']] = max(record['total_ms'] - children.get('', 0.0), 0.0)
+    return exclusive
+
+def collapsed_stacks(records: list) -> dict:
+    """Sum exclusive time (microseconds) per stack, ready for flame graph tools."""
+    totals = {}
+    for record in records:
+        for stack, ms in self_times(record).items():
+            totals[stack] = totals.get(stack, 0) + int(round(ms * 1000))
+    return totals
+
+def summarize(records: list) -> dict:
+    """Per-page rerun counts, total-time percentiles and per-section averages."""
+    pages = {}
+    for record in records:
+        pages.setdefault(record['page'], []).append(record)
+
+    summary = {}
+    for page, runs in sorted(pages.items()):
+        totals = sorted(run['total_ms'] for run in runs)
+        sections = {}
+        for run in runs:
+            for stack, ms in self_times(run).items():
+                sections.setdefault(stack.partition(';')[2] or '(page)', []).append(ms)
+        grand_total = sum(totals)
+        summary[page] = {
+            'reruns': len(runs),
+            'incomplete': sum(1 for run in runs if not run['complete']),
+            'median_ms': round(statistics.median(totals), 3),
+            'p95_ms': round(totals[min(int(len(totals) * 0.95), len(totals) - 1)], 3),
+            'sections': {
+                stack: {
+                    'mean_self_ms': round(sum(values) / len(runs), 3),
+                    'share': round(sum(values) / grand_total, 3) if grand_total else 0.0,
+                }
+                for stack, values in sorted(sections.items(), key=lambda item: -sum(item[1]))
+            },
+        }
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize page profiles written with PAGE_PROFILE=1.")
+    parser.add_argument('--log', default=PROFILE_LOG)
+    parser.add_argument('--page', help="only this page")
+    parser.add_argument('--collapsed', action='store_true',
+                        help="print collapsed stacks (flamegraph.pl / speedscope input) instead")
+    args = parser.parse_args()
+
+    records = read_profiles(args.log, args.page)
+    if args.collapsed:
+        for stack, micros in sorted(collapsed_stacks(records).items()):
+            print(f"{stack} {micros}")
+        return
+
+    for page, page_summary in summarize(records).items():
+        print(f"{page}: {page_summary['reruns']} reruns ({page_summary['incomplete']} incomplete), "
+              f"median {page_summary['median_ms']:.1f} ms, p95 {page_summary['p95_ms']:.1f} ms")
+        for stack, stats in page_summary['sections'].items():
+            print(f"  {stack:<48}{stats['mean_self_ms']:>10.2f} ms{stats['share']:>8.1%}")
+
+if __name__ == '__main__':
+    main()
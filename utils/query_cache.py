@@ -0,0 +1,221 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+import pandas as pd
+
+_MISSING = object()
+
+class QueryCache:
+    """Thread-safe LRU cache with a per-entry TTL and tag-based invalidation.
+
+    Each ``invalidate_tags`` call takes the next number of an invalidation
+    sequence, remembered per tag for the most recent ``max_entries`` tags.
+    Older tags are forgotten by raising a floor instead, so one-off tags
+    such as session ids don't accumulate.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._invalidated = OrderedDict()
+        self._sequence = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0,
+        }
+
+    def get(self, key, default=None):
+        """Get a live entry, counting the lookup as a hit or a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return default
+            value, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self._counters['expirations'] += 1
+                self._counters['misses'] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return value
+
+    def generation(self, tags=()) -> int:
+        """Snapshot the invalidation sequence, to pass to :meth:`set` later."""
+        with self._lock:
+            return self._sequence
+
+    def set(self, key, value, tags=(), ttl: float = None, generation: int = None):
+        """Store an entry under ``key``, evicting the least recently used if full.
+
+        If any of ``tags`` was invalidated after ``generation`` (from
+        :meth:`generation`, taken before the value was computed), a write
+        happened in the meantime and the possibly stale value is not
+        stored. Neither is it when the snapshot predates the forgotten tags.
+        """
+        if self.max_entries <= 0:
+            return
+        tags = tuple(tags)
+        with self._lock:
+            if generation is not None and (
+                generation < self._floor
+                or any(self._invalidated.get(tag, 0) > generation for tag in tags)
+            ):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl), tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._counters['evictions'] += 1
+
+    def invalidate(self, key):
+        """Drop a single entry."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                self._counters['invalidations'] += 1
+
+    def invalidate_tags(self, tags):
+        """Drop every entry carrying any of ``tags``."""
+        with self._lock:
+            self._sequence += 1
+            for tag in tags:
+                self._invalidated[tag] = self._sequence
+                self._invalidated.move_to_end(tag)
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+                    self._counters['invalidations'] += 1
+            while len(self._invalidated) > max(self.max_entries, 1):
+                _, self._floor = self._invalidated.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> dict:
+        """Return the current size and hit/miss counters."""
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                **self._counters,
+                'hit_rate': self._counters['hits'] / lookups if lookups else 0.0,
+            }
+
+    def _remove(self, key):
+        """Remove an entry and its tag references; caller holds the lock."""
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+_query_cache = None
+_query_cache_lock = threading.Lock()
+
+def get_query_cache() -> QueryCache:
+    """Get the process-wide query cache, sized by ``QUERY_CACHE_SIZE`` / ``QUERY_CACHE_TTL``."""
+    global _query_cache
+    if _query_cache is None:
+        with _query_cache_lock:
+            if _query_cache is None:
+                _query_cache = QueryCache(
+                    max_entries=int(os.environ.get('QUERY_CACHE_SIZE', 1024)),
+                    ttl=float(os.environ.get('QUERY_CACHE_TTL', 30)),
+                )
+    return _query_cache
+
+def cache_stats() -> dict:
+    """Get hit/miss statistics for the process-wide query cache."""
+    return get_query_cache().stats()
+
+def _freeze(value):
+    """Turn list/dict arguments into hashable equivalents for cache keys."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+def _detach(value):
+    """Hand out a copy so callers can't modify the cached object in place."""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, (list, tuple)):
+        # get_data returns a tuple of frames, each of which needs detaching
+        return type(value)(_detach(v) for v in value)
+    return value
+
+def tenant_tags(tenant_id: int, tables) -> list:
+    """Build the invalidation tags for a tenant's tables."""
+    return [(tenant_id, table) for table in tables]
+
+def cached_query(*tables):
+    """Cache a tenant-scoped read method, keyed by tenant, method and arguments.
+
+    ``tables`` are the tables the result depends on; writes to any of them
+    for the same tenant invalidate the entry.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            self._check_tenant()
+            cache = get_query_cache()
+            key = (self.tenant_id, method.__name__, _freeze(args), _freeze(kwargs))
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                tags = tenant_tags(self.tenant_id, tables)
+                generation = cache.generation(tags)
+                value = method(self, *args, **kwargs)
+                cache.set(key, value, tags=tags, generation=generation)
+            return _detach(value)
+        return wrapper
+    return decorator
+
+def async_cached_query(*tables):
+    """Coroutine counterpart of ``cached_query`` for async data managers.
+
+    Entries share the process-wide cache, so writes through either manager
+    invalidate reads made through the other.
+    """
+    def decorator(method):
+        @wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            self._check_tenant()
+            cache = get_query_cache()
+            key = (self.tenant_id, method.__qualname__, _freeze(args), _freeze(kwargs))
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                tags = tenant_tags(self.tenant_id, tables)
+                generation = cache.generation(tags)
+                value = await method(self, *args, **kwargs)
+                cache.set(key, value, tags=tags, generation=generation)
+            return _detach(value)
+        return wrapper
+    return decorator
+
+def invalidate_tables(tenant_id: int, *tables):
+    """Invalidate cached reads of ``tables`` for a tenant after a write."""
+    get_query_cache().invalidate_tags(tenant_tags(tenant_id, tables))
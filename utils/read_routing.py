@@ -0,0 +1,133 @@
+import logging
+import os
+import threading
+import time
+from utils.db_pool import get_pool, get_replica_pool
+
+logger = logging.getLogger(__name__)
+
+# Replication delay measured on the replica; zero when it has replayed
+# everything it received, and for a server that is not a standby at all
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+class ReadRouter:
+    """Choose the pool a tenant's read-only query should use.
+
+    Reads go to the replica unless
+      - no replica is configured (``REPLICA_DATABASE_URL`` unset),
+      - the tenant wrote within the last ``sticky_seconds``, so its own
+        changes may not have replicated yet,
+      - the replica is more than ``max_lag`` seconds behind, or its lag
+        cannot be measured (the replica is down or not yet replaying).
+    The lag is measured at most once every ``check_interval`` seconds.
+    """
+
+    def __init__(self, max_lag: float = 5.0, sticky_seconds: float = 10.0,
+                 check_interval: float = 1.0):
+        self.max_lag = max_lag
+        self.sticky_seconds = sticky_seconds
+        self.check_interval = check_interval
+        self._last_write = {}
+        self._lag = None
+        self._lag_checked = None
+        self._lock = threading.Lock()
+        self._counters = {
+            'replica_reads': 0,
+            'primary_reads': 0,
+            'sticky_reads': 0,
+            'lagging_reads': 0,
+            'lag_check_failures': 0,
+        }
+
+    def note_write(self, tenant_id: int):
+        """Pin the tenant's reads to the primary for ``sticky_seconds``."""
+        with self._lock:
+            self._last_write[tenant_id] = time.monotonic()
+
+    def pool_for_read(self, tenant_id: int):
+        """Get the pool for a read-only query on behalf of ``tenant_id``."""
+        primary = get_pool()
+        if not os.environ.get('REPLICA_DATABASE_URL'):
+            self._count('primary_reads')
+            return primary
+
+        with self._lock:
+            written = self._last_write.get(tenant_id)
+            if written is not None and time.monotonic() - written >= self.sticky_seconds:
+                del self._last_write[tenant_id]
+                written = None
+        if written is not None:
+            self._count('sticky_reads')
+            return primary
+
+        lag = self.replica_lag()
+        if lag is None or lag > self.max_lag:
+            self._count('lagging_reads')
+            return primary
+        self._count('replica_reads')
+        return get_replica_pool()
+
+    def replica_lag(self):
+        """Replica lag in seconds, or None if it could not be measured."""
+        now = time.monotonic()
+        with self._lock:
+            if self._lag_checked is not None and now - self._lag_checked < self.check_interval:
+                return self._lag
+            # Claim this check so concurrent readers reuse the previous value
+            self._lag_checked = now
+
+        try:
+            with get_replica_pool().connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(REPLICA_LAG_SQL)
+                    lag = cur.fetchone()[0]
+                conn.rollback()
+            lag = float(lag) if lag is not None else None
+        except Exception:
+            logger.exception("Replica lag check failed")
+            self._count('lag_check_failures')
+            lag = None
+
+        with self._lock:
+            self._lag = lag
+        return lag
+
+    def stats(self) -> dict:
+        """Return routing counters and the last measured lag."""
+        with self._lock:
+            return {
+                **self._counters,
+                'replica_lag': self._lag,
+                'sticky_tenants': len(self._last_write),
+            }
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+_router = None
+_router_lock = threading.Lock()
+
+def get_read_router() -> ReadRouter:
+    """Get the process-wide read router.
+
+    Tuned with ``REPLICA_MAX_LAG`` (seconds, default 5),
+    ``REPLICA_STICKY_SECONDS`` (default 10) and
+    ``REPLICA_LAG_CHECK_INTERVAL`` (default 1).
+    """
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ReadRouter(
+                    max_lag=float(os.environ.get('REPLICA_MAX_LAG', 5)),
+                    sticky_seconds=float(os.environ.get('REPLICA_STICKY_SECONDS', 10)),
+                    check_interval=float(os.environ.get('REPLICA_LAG_CHECK_INTERVAL', 1)),
+                )
+    return _router
@@ -0,0 +1,153 @@
+import argparse
+import os
+import threading
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+from psycopg2.extensions import new_type, register_type
+
+# Text columns with few distinct values per result, loaded as categoricals;
+# member_name repeats on every visit row of attendance joins
+CATEGORICAL_COLUMNS = frozenset({'status', 'membership_type', 'type', 'category', 'member_name'})
+
+# Postgres type OIDs grouped by the column dtype they load into; anything
+# else (text, time, jsonb, ...) stays an object column
+_INT_TYPES = {20, 21, 23}
+_FLOAT_TYPES = {700, 701, 1700}
+_BOOL_TYPES = {16}
+_DATE_TYPES = {1082}
+_TIMESTAMP_TYPES = {1114, 1184}
+
+# Cursor-scoped casters: numerics arrive as floats rather than Decimals and
+# dates as ISO strings, which numpy parses in bulk
+_NUMERIC_AS_FLOAT = new_type((1700,), 'NUMERIC_AS_FLOAT',
+                             lambda value, cur: float(value) if value is not None else None)
+_DATE_AS_TEXT = new_type((1082,), 'DATE_AS_TEXT', lambda value, cur: value)
+
+def build_frame(columns: list, rows: list) -> pd.DataFrame:
+    """Build a typed DataFrame from (name, type_oid) columns and row tuples.
+
+    Integers load as int64 (nullable Int64 when NULLs occur), numerics as
+    float64, dates and timestamps as datetime64 and the names in
+    CATEGORICAL_COLUMNS as categoricals. Also accepts driver values such as
+    Decimal and date objects, so asyncpg records load the same way.
+    """
+    values_by_column = list(zip(*rows)) if rows else [()] * len(columns)
+    data = {}
+    for (name, type_code), values in zip(columns, values_by_column):
+        data[name] = _typed_column(name, type_code, values)
+    return pd.DataFrame(data, columns=[name for name, _ in columns])
+
+def _typed_column(name: str, type_code: int, values: tuple):
+    has_nulls = any(value is None for value in values)
+    if type_code in _INT_TYPES:
+        return pd.array(values, dtype='Int64') if has_nulls else np.array(values, dtype=np.int64)
+    if type_code in _FLOAT_TYPES:
+        return np.array(values, dtype=np.float64)
+    if type_code in _BOOL_TYPES:
+        return pd.array(values, dtype='boolean') if has_nulls else np.array(values, dtype=bool)
+    if type_code in _DATE_TYPES:
+        return np.array(values, dtype='datetime64[D]').astype('datetime64[ns]')
+    if type_code in _TIMESTAMP_TYPES:
+        return pd.to_datetime(pd.Series(values, dtype=object))
+    if name in CATEGORICAL_COLUMNS:
+        return pd.Categorical(values)
+    return np.array(values, dtype=object)
+
+_reports = {}
+_reports_lock = threading.Lock()
+
+def read_frame(conn, query: str, params=None, name: str = None) -> pd.DataFrame:
+    """Run a query on a psycopg2 connection and load the result into typed columns.
+
+    With ``name``, the frame's memory footprint is recorded under that name
+    (see ``memory_report``). Setting ``RESULT_MEMORY_BASELINE=1`` also
+    re-runs the query the way ``pd.read_sql_query`` loads it, to compare.
+    """
+    with conn.cursor() as cur:
+        register_type(_NUMERIC_AS_FLOAT, cur)
+        register_type(_DATE_AS_TEXT, cur)
+        cur.execute(query, params)
+        columns = [(column.name, column.type_code) for column in cur.description]
+        df = build_frame(columns, cur.fetchall())
+
+    if name:
+        baseline = None
+        if os.environ.get('RESULT_MEMORY_BASELINE') == '1':
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                baseline = pd.DataFrame.from_records(
+                    cur.fetchall(), columns=[column.name for column in cur.description], coerce_float=True
+                )
+        record_memory(name, df, baseline)
+    return df
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """Deep memory usage of a DataFrame, including the objects it references."""
+    return int(df.memory_usage(deep=True).sum())
+
+def record_memory(name: str, df: pd.DataFrame, baseline: pd.DataFrame = None):
+    """Record the footprint of the latest frame loaded for a query."""
+    report = {
+        'rows': len(df),
+        'bytes': frame_bytes(df),
+        'dtypes': {column: str(dtype) for column, dtype in df.dtypes.items()},
+    }
+    if baseline is not None:
+        report['baseline_bytes'] = frame_bytes(baseline)
+        report['saved_ratio'] = (
+            round(1 - report['bytes'] / report['baseline_bytes'], 3) if report['baseline_bytes'] else 0.0
+        )
+    with _reports_lock:
+        _reports[name] = report
+
+def memory_report() -> dict:
+    """Get the footprint recorded for the latest load of each named query."""
+    with _reports_lock:
+        return {name: dict(report) for name, report in _reports.items()}
+
+def reset_memory_report():
+    """Forget recorded footprints."""
+    with _reports_lock:
+        _reports.clear()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load a tenant's data through DataManager and report DataFrame memory per query."
+    )
+    parser.add_argument('--tenant-id', type=int, required=True)
+    parser.add_argument('--days', type=int, default=365, help="date range for the report queries")
+    args = parser.parse_args()
+
+    from utils.data_manager import DataManager
+    from utils.query_cache import get_query_cache
+    # DataManager records into the imported module, not this __main__ copy
+    from utils.result_loader import memory_report
+
+    os.environ['RESULT_MEMORY_BASELINE'] = '1'
+    get_query_cache().clear()
+    dm = DataManager(args.tenant_id)
+    end = date.today()
+    start = end - timedelta(days=args.days)
+    dm.get_members()
+    dm.search_members()
+    dm.get_attendance_daily(start, end)
+    dm.get_attendance_report(start, end)
+    dm.get_financial_summary()
+    dm.get_recent_transactions()
+    dm.get_finance_totals(start, end)
+    dm.get_finance_series(start, end)
+    dm.get_data(incremental=False)
+
+    total = baseline_total = 0
+    print(f"{'query':<32}{'rows':>10}{'bytes':>14}{'read_sql':>14}{'saved':>8}")
+    for name, report in memory_report().items():
+        total += report['bytes']
+        baseline_total += report['baseline_bytes']
+        print(f"{name:<32}{report['rows']:>10}{report['bytes']:>14}"
+              f"{report['baseline_bytes']:>14}{report['saved_ratio']:>8.1%}")
+    if baseline_total:
+        print(f"{'total':<32}{'':>10}{total:>14}{baseline_total:>14}{1 - total / baseline_total:>8.1%}")
+
+if __name__ == '__main__':
+    main()
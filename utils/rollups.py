@@ -0,0 +1,78 @@
+def refresh_attendance_daily(cur, tenant_id: int, dates: list):
+    """Recompute the attendance_daily rows of a tenant for the given dates.
+
+    Used after bulk loads, where recomputing each touched day from the
+    (tenant_id, date) index is simpler than tracking per-row deltas.
+    """
+    if not dates:
+        return
+    cur.execute(
+        """
+        INSERT INTO attendance_daily (
+            tenant_id, date, visits, unique_members, completed_visits, total_session_seconds
+        )
+        SELECT tenant_id, date, COUNT(*), COUNT(DISTINCT member_id), COUNT(check_out),
+               COALESCE(SUM(GREATEST(EXTRACT(EPOCH FROM check_out - check_in), 0)), 0)::bigint
+        FROM attendance
+        WHERE tenant_id = %s AND date = ANY(%s::date[])
+        GROUP BY tenant_id, date
+        ON CONFLICT (tenant_id, date) DO UPDATE
+        SET visits = EXCLUDED.visits,
+            unique_members = EXCLUDED.unique_members,
+            completed_visits = EXCLUDED.completed_visits,
+            total_session_seconds = EXCLUDED.total_session_seconds
+        """,
+        (tenant_id, list(dates))
+    )
+
+# Additive upserts of (date, type, category, amount, entries) deltas, taking
+# the array parameters built by finance_rollup_params()
+FINANCE_DAILY_SQL = """
+    INSERT INTO finance_daily (tenant_id, date, type, category, total, entries)
+    SELECT %(tenant_id)s::int, v.date, v.type, v.category, SUM(v.amount), SUM(v.entries)
+    FROM unnest(%(dates)s::date[], %(types)s::text[], %(categories)s::text[],
+                %(amounts)s::numeric[], %(entries)s::int[])
+        AS v (date, type, category, amount, entries)
+    GROUP BY v.date, v.type, v.category
+    ON CONFLICT (tenant_id, date, type, category) DO UPDATE
+    SET total = finance_daily.total + EXCLUDED.total,
+        entries = finance_daily.entries + EXCLUDED.entries
+"""
+
+FINANCE_MONTHLY_SQL = """
+    INSERT INTO finance_monthly (tenant_id, month, type, category, total, entries)
+    SELECT %(tenant_id)s::int, date_trunc('month', v.date)::date, v.type, v.category,
+           SUM(v.amount), SUM(v.entries)
+    FROM unnest(%(dates)s::date[], %(types)s::text[], %(categories)s::text[],
+                %(amounts)s::numeric[], %(entries)s::int[])
+        AS v (date, type, category, amount, entries)
+    GROUP BY date_trunc('month', v.date)::date, v.type, v.category
+    ON CONFLICT (tenant_id, month, type, category) DO UPDATE
+    SET total = finance_monthly.total + EXCLUDED.total,
+        entries = finance_monthly.entries + EXCLUDED.entries
+"""
+
+def finance_rollup_params(tenant_id: int, rows: list) -> dict:
+    """Turn (date, type, category, amount, entries) rows into array parameters."""
+    dates, types, categories, amounts, entries = (list(column) for column in zip(*rows))
+    return {
+        'tenant_id': tenant_id,
+        'dates': dates,
+        'types': types,
+        'categories': [category or '' for category in categories],
+        'amounts': amounts,
+        'entries': entries,
+    }
+
+def add_finance_rollups(cur, tenant_id: int, rows: list):
+    """Add finance deltas to the daily and monthly rollups.
+
+    ``rows`` are (date, type, category, amount, entries) tuples; several rows
+    may fall on the same day or month. The upserts only ever add, so
+    concurrent writers cannot lose each other's totals.
+    """
+    if not rows:
+        return
+    params = finance_rollup_params(tenant_id, rows)
+    cur.execute(FINANCE_DAILY_SQL, params)
+    cur.execute(FINANCE_MONTHLY_SQL, params)
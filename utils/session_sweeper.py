@@ -0,0 +1,131 @@
+import argparse
+import logging
+import os
+import threading
+import time
+from utils.db_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+class SessionSweeper:
+    """Delete expired and logged-out sessions in bounded batches.
+
+    Each batch is its own short transaction that deletes at most
+    ``batch_size`` rows, skipping rows locked by concurrent logins or
+    logouts, so sweeping never holds long locks on ``sessions``.
+    """
+
+    def __init__(self, batch_size: int = 1000, max_batches: int = 100,
+                 grace_period: int = 0):
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.grace_period = grace_period
+        self.pool = get_pool()
+        self.last_run = None
+
+    def sweep(self) -> dict:
+        """Run one sweep and report how many rows were reclaimed."""
+        started = time.perf_counter()
+        deleted = 0
+        batches = 0
+        complete = False
+
+        while batches < self.max_batches:
+            with self.pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        DELETE FROM sessions
+                        WHERE session_id IN (
+                            SELECT session_id
+                            FROM sessions
+                            WHERE expires_at < CURRENT_TIMESTAMP - make_interval(secs => %s)
+                            OR is_active = false
+                            LIMIT %s
+                            FOR UPDATE SKIP LOCKED
+                        )
+                        """,
+                        (self.grace_period, self.batch_size)
+                    )
+                    batch_deleted = cur.rowcount
+                    conn.commit()
+            batches += 1
+            deleted += batch_deleted
+            if batch_deleted < self.batch_size:
+                complete = True
+                break
+
+        self.last_run = {
+            'deleted': deleted,
+            'batches': batches,
+            'complete': complete,
+            'seconds': round(time.perf_counter() - started, 3),
+        }
+        return self.last_run
+
+    def vacuum(self):
+        """Run VACUUM ANALYZE on sessions so freed space and stats are reclaimed promptly."""
+        with self.pool.connection() as conn:
+            conn.autocommit = True
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("VACUUM (ANALYZE) sessions")
+            finally:
+                conn.autocommit = False
+
+_sweeper_thread = None
+_sweeper_lock = threading.Lock()
+
+def start_background_sweeper(interval: float = None) -> bool:
+    """Start the in-process sweeper thread once per process.
+
+    Runs every ``SESSION_SWEEP_INTERVAL`` seconds (default 3600); setting it
+    to 0 disables the in-app sweeper, e.g. when the CLI runs from cron.
+    Returns True if the thread is running.
+    """
+    global _sweeper_thread
+    if interval is None:
+        interval = float(os.environ.get('SESSION_SWEEP_INTERVAL', 3600))
+    if interval <= 0:
+        return False
+
+    with _sweeper_lock:
+        if _sweeper_thread is None or not _sweeper_thread.is_alive():
+            sweeper = SessionSweeper()
+
+            def run():
+                while True:
+                    try:
+                        sweeper.sweep()
+                    except Exception:
+                        logger.exception("Session sweep failed")
+                    time.sleep(interval)
+
+            _sweeper_thread = threading.Thread(target=run, name='session-sweeper', daemon=True)
+            _sweeper_thread.start()
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete expired and inactive sessions.")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--max-batches', type=int, default=1000)
+    parser.add_argument('--grace-period', type=int, default=0,
+                        help="keep sessions for this many seconds after they expire")
+    parser.add_argument('--vacuum', action='store_true', help="VACUUM ANALYZE sessions afterwards")
+    parser.add_argument('--loop', type=float, metavar='SECONDS',
+                        help="keep sweeping at this interval instead of running once")
+    args = parser.parse_args()
+
+    sweeper = SessionSweeper(args.batch_size, args.max_batches, args.grace_period)
+    while True:
+        report = sweeper.sweep()
+        print(f"Deleted {report['deleted']} sessions in {report['batches']} batches "
+              f"({report['seconds']}s)")
+        if args.vacuum and report['deleted']:
+            sweeper.vacuum()
+        if args.loop is None:
+            break
+        time.sleep(args.loop)
+
+if __name__ == '__main__':
+    main()
@@ -1,73 +1,271 @@
+import logging
 import os
+import select
+import threading
+import time
+import pandas as pd
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from datetime import datetime
+from psycopg2.extras import Json, RealDictCursor
+from utils.data_manager import ACTIVE_MEMBER_STATUS
+from utils.db_pool import get_pool
+from utils.metrics import instrument
+from utils.result_loader import read_frame
+from datetime import date, timedelta
 
+logger = logging.getLogger(__name__)
+
+# Channel notified by create_tenant/update_tenant_settings with the tenant id
+TENANT_CHANNEL = 'tenants_changed'
+
+class TenantDirectory:
+    """In-memory copy of the tenants table, indexed by id and subdomain.
+
+    The directory reloads lazily after ``invalidate()`` or once ``ttl``
+    seconds have passed. A listener thread invalidates it whenever a
+    ``tenants_changed`` notification arrives, so other processes see new or
+    updated tenants right away; the TTL covers notifications missed while
+    the listener was reconnecting.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self.pool = get_pool()
+        self._tenants = []
+        self._by_id = {}
+        self._by_subdomain = {}
+        self._loaded_at = None
+        self._stale = True
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def invalidate(self):
+        """Mark the directory for reload on next access."""
+        self._stale = True
+
+    def list(self) -> list:
+        """All tenants, newest first."""
+        self._ensure_fresh()
+        return [
+            {k: v for k, v in tenant.items() if k != 'settings'}
+            for tenant in self._tenants
+        ]
+
+    def get(self, tenant_id: int) -> dict:
+        """Get a tenant by id, or None."""
+        self._ensure_fresh()
+        tenant = self._by_id.get(tenant_id)
+        return dict(tenant) if tenant else None
+
+    def get_by_subdomain(self, subdomain: str) -> dict:
+        """Get a tenant by subdomain, or None."""
+        self._ensure_fresh()
+        tenant = self._by_subdomain.get(subdomain)
+        return dict(tenant) if tenant else None
+
+    def list_owned(self, owner_id: int) -> list:
+        """Tenants controlled by an owner account, newest first."""
+        return [tenant for tenant in self.list() if tenant['owner_id'] == owner_id]
+
+    def _ensure_fresh(self):
+        if not self._stale and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        with self._lock:
+            if not self._stale and time.monotonic() - self._loaded_at < self.ttl:
+                return
+            # Clear the flag before loading so a notification arriving
+            # mid-load triggers another reload
+            self._stale = False
+            try:
+                self._load()
+            except Exception:
+                self._stale = True
+                raise
+
+    def _load(self):
+        with self.pool.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT id, name, subdomain, created_at, status, owner_id, settings
+                    FROM tenants
+                    ORDER BY created_at DESC
+                    """
+                )
+                tenants = [dict(row) for row in cur.fetchall()]
+        self._tenants = tenants
+        self._by_id = {tenant['id']: tenant for tenant in tenants}
+        self._by_subdomain = {tenant['subdomain']: tenant for tenant in tenants}
+        self._loaded_at = time.monotonic()
+
+    def start_listener(self):
+        """Start the LISTEN thread once; it holds its own dedicated connection."""
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen, name='tenant-directory-listener', daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self):
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(self.pool.dsn)
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {TENANT_CHANNEL}")
+                # Changes made while we were disconnected were not notified
+                self.invalidate()
+                while True:
+                    if select.select([conn], [], [], 60) == ([], [], []):
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        self.invalidate()
+            except Exception:
+                logger.exception("Tenant directory listener failed; reconnecting in 5s")
+                self.invalidate()
+                time.sleep(5)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+_directory = None
+_directory_lock = threading.Lock()
+
+def get_tenant_directory() -> TenantDirectory:
+    """Get the process-wide tenant directory, starting its listener on first use.
+
+    The TTL fallback is configured with ``TENANT_DIRECTORY_TTL`` (seconds).
+    """
+    global _directory
+    if _directory is None:
+        with _directory_lock:
+            if _directory is None:
+                _directory = TenantDirectory(ttl=float(os.environ.get('TENANT_DIRECTORY_TTL', 300)))
+                _directory.start_listener()
+    return _directory
+
+# Per-gym totals for one owner; each source is aggregated once across all
+# of the owner's gyms and joined back by tenant
+OWNER_SUMMARY_SQL = """
+    WITH owned AS (
+        SELECT id, name, subdomain, status
+        FROM tenants
+        WHERE owner_id = %(owner_id)s
+    ),
+    member_totals AS (
+        SELECT tenant_id,
+               COUNT(*) AS total_members,
+               COUNT(*) FILTER (WHERE status = %(active_status)s) AS active_members,
+               COUNT(*) FILTER (WHERE join_date BETWEEN %(start)s AND %(end)s) AS new_members
+        FROM members
+        WHERE tenant_id IN (SELECT id FROM owned)
+        GROUP BY tenant_id
+    ),
+    attendance_totals AS (
+        SELECT tenant_id, SUM(visits) AS visits
+        FROM attendance_daily
+        WHERE tenant_id IN (SELECT id FROM owned) AND date BETWEEN %(start)s AND %(end)s
+        GROUP BY tenant_id
+    ),
+    finance_totals AS (
+        SELECT tenant_id,
+               SUM(total) FILTER (WHERE type = 'income') AS income,
+               SUM(total) FILTER (WHERE type = 'expense') AS expenses
+        FROM finance_daily
+        WHERE tenant_id IN (SELECT id FROM owned) AND date BETWEEN %(start)s AND %(end)s
+        GROUP BY tenant_id
+    )
+    SELECT o.id AS tenant_id, o.name, o.subdomain, o.status,
+           COALESCE(m.total_members, 0) AS total_members,
+           COALESCE(m.active_members, 0) AS active_members,
+           COALESCE(m.new_members, 0) AS new_members,
+           COALESCE(a.visits, 0) AS visits,
+           COALESCE(f.income, 0) AS income,
+           COALESCE(f.expenses, 0) AS expenses,
+           COALESCE(f.income, 0) - COALESCE(f.expenses, 0) AS net
+    FROM owned o
+    LEFT JOIN member_totals m ON m.tenant_id = o.id
+    LEFT JOIN attendance_totals a ON a.tenant_id = o.id
+    LEFT JOIN finance_totals f ON f.tenant_id = o.id
+    ORDER BY o.name
+"""
+
+@instrument
 class TenantManager:
     def __init__(self):
-        self.conn = psycopg2.connect(os.environ['DATABASE_URL'])
-        
-    def create_tenant(self, name: str, subdomain: str) -> dict:
-        """Create a new tenant (gym) in the system."""
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """
-                INSERT INTO tenants (name, subdomain)
-                VALUES (%s, %s)
-                RETURNING id, name, subdomain, created_at, status
-                """,
-                (name, subdomain)
-            )
-            self.conn.commit()
-            return cur.fetchone()
-    
+        self.pool = get_pool()
+        self.directory = get_tenant_directory()
+
+    def create_tenant(self, name: str, subdomain: str, owner_id: int = None) -> dict:
+        """Create a new tenant (gym) in the system, optionally owned by an owner account."""
+        with self.pool.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    INSERT INTO tenants (name, subdomain, owner_id)
+                    VALUES (%s, %s, %s)
+                    RETURNING id, name, subdomain, created_at, status, owner_id
+                    """,
+                    (name, subdomain, owner_id)
+                )
+                tenant = cur.fetchone()
+                cur.execute("SELECT pg_notify(%s, %s)", (TENANT_CHANNEL, str(tenant['id'])))
+                conn.commit()
+        self.directory.invalidate()
+        return tenant
+
     def get_tenant_by_subdomain(self, subdomain: str) -> dict:
         """Get tenant details by subdomain."""
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """
-                SELECT id, name, subdomain, created_at, status, settings
-                FROM tenants
-                WHERE subdomain = %s
-                """,
-                (subdomain,)
-            )
-            return cur.fetchone()
-    
+        return self.directory.get_by_subdomain(subdomain)
+
     def update_tenant_settings(self, tenant_id: int, settings: dict) -> bool:
         """Update tenant settings."""
-        with self.conn.cursor() as cur:
-            cur.execute(
-                """
-                UPDATE tenants
-                SET settings = settings || %s::jsonb
-                WHERE id = %s
-                """,
-                (settings, tenant_id)
-            )
-            self.conn.commit()
-            return True
-    
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE tenants
+                    SET settings = settings || %s::jsonb
+                    WHERE id = %s
+                    """,
+                    (Json(settings), tenant_id)
+                )
+                cur.execute("SELECT pg_notify(%s, %s)", (TENANT_CHANNEL, str(tenant_id)))
+                conn.commit()
+        self.directory.invalidate()
+        return True
+
     def list_tenants(self) -> list:
         """List all tenants in the system."""
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """
-                SELECT id, name, subdomain, created_at, status
-                FROM tenants
-                ORDER BY created_at DESC
-                """
+        return self.directory.list()
+
+    def list_owner_tenants(self, owner_id: int) -> list:
+        """List the tenants an owner controls."""
+        return self.directory.list_owned(owner_id)
+
+    def get_owner_summary(self, owner_id: int, start_date=None, end_date=None) -> pd.DataFrame:
+        """Members, attendance and revenue for every gym an owner controls.
+
+        One grouped query over the members table and the attendance and
+        finance rollups, returning a row per gym (gyms without activity
+        get zeros). The date range defaults to the last 30 days and applies
+        to new members, visits and finance totals.
+        """
+        end_date = end_date or date.today()
+        start_date = start_date or pd.Timestamp(end_date).date() - timedelta(days=29)
+        with self.pool.connection() as conn:
+            return read_frame(
+                conn,
+                OWNER_SUMMARY_SQL,
+                {'owner_id': owner_id, 'start': start_date, 'end': end_date,
+                 'active_status': ACTIVE_MEMBER_STATUS},
+                name='get_owner_summary'
             )
-            return cur.fetchall()
-    
+
     def validate_tenant_access(self, tenant_id: int) -> bool:
         """Validate if a tenant exists and is active."""
-        with self.conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT status FROM tenants
-                WHERE id = %s AND status = 'active'
-                """,
-                (tenant_id,)
-            )
-            return cur.fetchone() is not None
+        tenant = self.directory.get(tenant_id)
+        return tenant is not None and tenant['status'] == 'active'